@@ -1,31 +1,59 @@
 """
 Service for converting transformation insights into Anki cards.
 """
+import asyncio
+import functools
 import json
 import re
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Set
 
 from loguru import logger
 
-from open_notebook.database.repository import repo_query
+from open_notebook.database.repository import ensure_record_id, repo_query
 from open_notebook.domain.notebook import SourceInsight
+from open_notebook.utils import json_loads
+
+# Fallback extractors for LLM output that is not bare JSON
+_JSON_BLOCK_RE = re.compile(r'```json\s*(\[.*?\])\s*```', re.DOTALL)
+_JSON_ARRAY_RE = re.compile(r'\[[\s\S]*?\{[\s\S]*?"front"[\s\S]*?\}[\s\S]*?\]')
 
 
 class AnkiInsightsService:
     """Service for parsing and converting Anki card insights."""
     
-    ANKI_TRANSFORMATION_PATTERNS = [
-        r"anki[_\s]",  # Matches "anki_" or "anki "
-        r"flashcard",
-        r"card[s]?\s*-\s*dutch",
-    ]
+    # Keywords equivalent to the patterns "anki[_\s]", "flashcard" and
+    # "card[s]?\s*-\s*dutch"; plain substring scans beat the regex VM here
+    ANKI_KEYWORDS = ("anki_", "flashcard")
+    
+    # Coarse DB-side prefilter (superset of the keywords above) so non-Anki
+    # insights are never transferred; is_anki_insight still makes the final call
+    _ANKI_SQL_FILTER = """(
+                string::lowercase(insight_type) CONTAINS 'anki'
+                OR string::lowercase(insight_type) CONTAINS 'flashcard'
+                OR string::lowercase(insight_type) CONTAINS 'dutch'
+            )"""
     
     @staticmethod
+    @functools.lru_cache(maxsize=256)
     def is_anki_insight(insight_type: str) -> bool:
         """Check if an insight is an Anki card generation insight."""
-        insight_lower = insight_type.lower()
-        return any(re.search(pattern, insight_lower, re.IGNORECASE) 
-                  for pattern in AnkiInsightsService.ANKI_TRANSFORMATION_PATTERNS)
+        lowered = insight_type.lower()
+        if any(keyword in lowered for keyword in AnkiInsightsService.ANKI_KEYWORDS):
+            return True
+        # "anki" followed by any whitespace character
+        index = lowered.find("anki")
+        while index != -1:
+            if lowered[index + 4:index + 5].isspace():
+                return True
+            index = lowered.find("anki", index + 4)
+        # "card" or "cards", optional whitespace, "-", optional whitespace, "dutch"
+        index = lowered.find("dutch")
+        while index != -1:
+            head = lowered[:index].rstrip()
+            if head.endswith("-") and head[:-1].rstrip().endswith(("card", "cards")):
+                return True
+            index = lowered.find("dutch", index + 5)
+        return False
     
     @staticmethod
     def parse_cards_from_insight(content: str) -> List[Dict]:
@@ -44,39 +72,93 @@ class AnkiInsightsService:
         
         Returns list of card dictionaries or empty list if parsing fails.
         """
+        # The first non-whitespace character tells a bare array from a bare
+        # object; anything else skips straight to the extraction fallbacks
+        stripped = content.lstrip()
         try:
-            # Try direct JSON parse
-            cards = json.loads(content)
-            if isinstance(cards, list):
-                return cards
-            elif isinstance(cards, dict):
-                return [cards]
-            else:
-                logger.warning(f"Unexpected JSON structure: {type(cards)}")
-                return []
+            if stripped.startswith("["):
+                return json_loads(stripped)
+            if stripped.startswith("{"):
+                return [json_loads(stripped)]
         except json.JSONDecodeError:
-            # Try to extract JSON from markdown code blocks
-            json_match = re.search(r'```json\s*(\[.*?\])\s*```', content, re.DOTALL)
-            if json_match:
-                try:
-                    cards = json.loads(json_match.group(1))
-                    if isinstance(cards, list):
-                        return cards
-                except json.JSONDecodeError as e:
-                    logger.warning(f"Failed to parse JSON from code block: {e}")
-            
-            # Try to find JSON array anywhere in the content
-            json_match = re.search(r'\[[\s\S]*?\{[\s\S]*?"front"[\s\S]*?\}[\s\S]*?\]', content)
-            if json_match:
-                try:
-                    cards = json.loads(json_match.group(0))
-                    if isinstance(cards, list):
-                        return cards
-                except json.JSONDecodeError as e:
-                    logger.warning(f"Failed to parse extracted JSON: {e}")
-            
-            logger.error(f"Could not parse cards from insight content")
-            return []
+            pass
+        
+        # Try to extract JSON from markdown code blocks
+        json_match = _JSON_BLOCK_RE.search(content) if "```json" in content else None
+        if json_match:
+            try:
+                cards = json_loads(json_match.group(1))
+                if isinstance(cards, list):
+                    return cards
+            except json.JSONDecodeError as e:
+                logger.warning(f"Failed to parse JSON from code block: {e}")
+        
+        # Try to find JSON array anywhere in the content; the substring screen
+        # keeps the backtracking-prone regex away from plain prose
+        json_match = (
+            _JSON_ARRAY_RE.search(content)
+            if '"front"' in content and "[" in content
+            else None
+        )
+        if json_match:
+            try:
+                cards = json_loads(json_match.group(0))
+                if isinstance(cards, list):
+                    return cards
+            except json.JSONDecodeError as e:
+                logger.warning(f"Failed to parse extracted JSON: {e}")
+        
+        logger.error(f"Could not parse cards from insight content")
+        return []
+    
+    @staticmethod
+    def _cards_for_row(row: Dict[str, Any], pending: List[Dict[str, Any]]) -> List[Dict]:
+        """
+        Return cards for an insight row, preferring the stored content_parsed.
+        
+        Rows that had to be parsed are appended to `pending` so the result can be
+        written back once for the whole batch.
+        """
+        cached = row.get("content_parsed")
+        if isinstance(cached, list):
+            return cached
+        cards = AnkiInsightsService.parse_cards_from_insight(row.get("content") or "")
+        if cards and row.get("id"):
+            pending.append({"id": ensure_record_id(row["id"]), "cards": cards})
+        return cards
+    
+    # Flipped off if the content_parsed field is not defined (migration 13 not applied)
+    _store_parsed_enabled = True
+    
+    # Write-backs run after the listing returns; keep references until they finish
+    _background_tasks: Set["asyncio.Task[Any]"] = set()
+    
+    @staticmethod
+    def _schedule_store_parsed_cards(pending: List[Dict[str, Any]]) -> None:
+        """Backfill content_parsed in the background so listings never wait on it."""
+        if not pending or not AnkiInsightsService._store_parsed_enabled:
+            return
+        task = asyncio.create_task(AnkiInsightsService._store_parsed_cards(pending))
+        AnkiInsightsService._background_tasks.add(task)
+        task.add_done_callback(AnkiInsightsService._background_tasks.discard)
+    
+    @staticmethod
+    async def _store_parsed_cards(pending: List[Dict[str, Any]]) -> None:
+        """Backfill content_parsed for freshly parsed insights in one query."""
+        if not pending or not AnkiInsightsService._store_parsed_enabled:
+            return
+        try:
+            await repo_query(
+                """
+                FOR $item IN $items {
+                    UPDATE $item.id SET content_parsed = $item.cards;
+                };
+                """,
+                {"items": pending},
+            )
+        except Exception as e:
+            AnkiInsightsService._store_parsed_enabled = False
+            logger.warning(f"Could not store parsed cards on insights, disabling backfill: {e}")
     
     @staticmethod
     async def get_anki_insights_for_source(source_id: str) -> List[tuple[SourceInsight, List[Dict]]]:
@@ -85,21 +167,24 @@ class AnkiInsightsService:
         
         Returns list of (insight, cards) tuples.
         """
-        query = """
+        query = f"""
             SELECT * FROM source_insight 
             WHERE source = $source_id
+            AND {AnkiInsightsService._ANKI_SQL_FILTER}
             ORDER BY created DESC
         """
         results = await repo_query(query, {"source_id": source_id})
         
         anki_insights = []
+        pending: List[Dict[str, Any]] = []
         for row in results:
             insight = SourceInsight(**row)
             if AnkiInsightsService.is_anki_insight(insight.insight_type):
-                cards = AnkiInsightsService.parse_cards_from_insight(insight.content)
+                cards = AnkiInsightsService._cards_for_row(row, pending)
                 if cards:
                     anki_insights.append((insight, cards))
         
+        AnkiInsightsService._schedule_store_parsed_cards(pending)
         return anki_insights
     
     @staticmethod
@@ -109,7 +194,7 @@ class AnkiInsightsService:
         
         Returns list of (insight, source_id, cards) tuples.
         """
-        query = """
+        query = f"""
             SELECT 
                 *,
                 source AS source_id
@@ -117,23 +202,22 @@ class AnkiInsightsService:
             WHERE source IN (
                 SELECT value FROM reference WHERE out = $notebook_id
             )
+            AND {AnkiInsightsService._ANKI_SQL_FILTER}
             ORDER BY created DESC
         """
         results = await repo_query(query, {"notebook_id": notebook_id})
         
         anki_insights = []
+        pending: List[Dict[str, Any]] = []
         for row in results:
             insight_data = {k: v for k, v in row.items() if k != 'source_id'}
             insight = SourceInsight(**insight_data)
             source_id = row.get('source_id')
             
             if AnkiInsightsService.is_anki_insight(insight.insight_type):
-                cards = AnkiInsightsService.parse_cards_from_insight(insight.content)
+                cards = AnkiInsightsService._cards_for_row(row, pending)
                 if cards:
                     anki_insights.append((insight, source_id, cards))
         
+        AnkiInsightsService._schedule_store_parsed_cards(pending)
         return anki_insights
-
-
-# Global service instance
-anki_insights_service = AnkiInsightsService()
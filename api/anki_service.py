@@ -1,11 +1,17 @@
 """
 Anki service layer for card management, CRUD operations, and lifecycle management.
 """
+import asyncio
+import functools
+import io
 import json
 import os
-from datetime import datetime, timedelta
+import re
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Coroutine, Dict, Iterable, List, Optional, Set, Tuple
 
 from loguru import logger
 
@@ -15,30 +21,113 @@ from open_notebook.domain.anki import (
     AnkiCardEdit,
     AnkiDeck,
     AnkiExportSession,
-    AudioMetadata,
     CEFRVote,
     ImageCache,
     ImageMetadata,
     SourceCitation,
 )
-from open_notebook.exceptions import DatabaseOperationError, InvalidInputError
+from open_notebook.exceptions import (
+    DatabaseOperationError,
+    InvalidInputError,
+    NotFoundError,
+)
+from open_notebook.utils import json_loads
+
+_JSON_ARRAY_RE = re.compile(r'\[.*\]', re.DOTALL)
+
+
+@functools.lru_cache(maxsize=1)
+def _card_generation_prompter():
+    """Load and compile the card generation template once per process."""
+    from ai_prompter import Prompter
+
+    return Prompter(prompt_template="anki_card_generation")
+
+
+class _TTLCache:
+    """Small LRU cache whose entries expire ttl seconds after they are stored."""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[str, Tuple[Any, float]]" = OrderedDict()
+
+    def get(self, key: str) -> Any:
+        item = self._data.get(key)
+        if item is None:
+            return None
+        value, stored_at = item
+        if time.monotonic() - stored_at >= self.ttl:
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self._data[key] = (value, time.monotonic())
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def pop(self, key: str, default: Any = None) -> Any:
+        item = self._data.pop(key, None)
+        return default if item is None else item[0]
+
+    def clear(self) -> None:
+        self._data.clear()
+
+
+# Short-lived lookup caches for decks and export sessions; the TTL bounds
+# staleness from writers outside this process. They hold private copies and
+# hand out copies, so callers mutating a result never change the cached one
+_deck_cache = _TTLCache(maxsize=256, ttl=30)
+_session_cache = _TTLCache(maxsize=256, ttl=30)
+_deck_list_cache = _TTLCache(maxsize=1, ttl=30)
+
+# Upper bound on unlinks in flight at once during bulk file cleanup
+_CLEANUP_CHUNK_SIZE = 256
+
+
+def _unlink_if_exists(file_path: str) -> None:
+    """Delete a file, treating an already-missing file as done."""
+    try:
+        os.unlink(file_path)
+        logger.info(f"Deleted file: {file_path}")
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        logger.warning(f"Error deleting file {file_path}: {str(e)}")
+
+
+@functools.lru_cache(maxsize=1)
+def _ensure_anki_dirs(anki_data_dir: Path) -> Tuple[Path, Path, Path, Path]:
+    """Create the image, audio, cache and upload directories once per process."""
+    images_dir = anki_data_dir / "images"
+    audio_dir = anki_data_dir / "audio"
+    cache_dir = images_dir / "cache"
+    uploads_dir = images_dir / "uploads"
+    for dir_path in (images_dir, audio_dir, cache_dir, uploads_dir):
+        dir_path.mkdir(parents=True, exist_ok=True)
+    return images_dir, audio_dir, cache_dir, uploads_dir
 
 
 class AnkiService:
     """Service layer for Anki card operations."""
 
+    # Strong references to fire-and-forget tasks so they are not GC'd mid-run
+    _background_tasks: Set["asyncio.Task[Any]"] = set()
+    # Cards with a history trim already queued; rapid edits share one cleanup
+    _pending_history_cleanups: Set[str] = set()
+    # In-flight card fetches; concurrent get_card calls for one id share a query
+    _inflight_card_gets: Dict[str, "asyncio.Task[AnkiCard]"] = {}
+
     def __init__(self):
         logger.info("Initializing Anki service")
         self.anki_data_dir = Path(UPLOADS_FOLDER) / "anki_data"
-        self.images_dir = self.anki_data_dir / "images"
-        self.audio_dir = self.anki_data_dir / "audio"
-        self.cache_dir = self.images_dir / "cache"
-        self.uploads_dir = self.images_dir / "uploads"
+        self.images_dir, self.audio_dir, self.cache_dir, self.uploads_dir = (
+            _ensure_anki_dirs(self.anki_data_dir)
+        )
         self.feedback_file = self.anki_data_dir / "generation_feedback.jsonl"
-        
-        # Ensure directories exist
-        for dir_path in [self.images_dir, self.audio_dir, self.cache_dir, self.uploads_dir]:
-            dir_path.mkdir(parents=True, exist_ok=True)
 
     def _load_generation_feedback_entries(self, limit: int = 100) -> List[Dict[str, Any]]:
         """Load most recent generation feedback entries from disk."""
@@ -77,7 +166,7 @@ class AnkiService:
     ) -> None:
         """Persist user feedback for generated cards to improve future generations."""
         payload: Dict[str, Any] = {
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
             "rating": rating,
             "feedback_text": (feedback_text or "").strip(),
             "prompt_template_key": prompt_template_key,
@@ -181,6 +270,8 @@ class AnkiService:
             await card.save()
             logger.info(f"Created Anki card: {card.id}")
             return card
+        except (InvalidInputError, NotFoundError):
+            raise
         except Exception as e:
             logger.error(f"Error creating Anki card: {str(e)}")
             raise DatabaseOperationError(e)
@@ -188,7 +279,20 @@ class AnkiService:
     async def get_card(self, card_id: str) -> Optional[AnkiCard]:
         """Get a card by ID."""
         try:
-            return await AnkiCard.get(card_id)
+            task = self._inflight_card_gets.get(card_id)
+            if task is None:
+                task = asyncio.create_task(AnkiCard.get(card_id))
+                self._inflight_card_gets[card_id] = task
+
+                def _forget(done: "asyncio.Task[AnkiCard]") -> None:
+                    if self._inflight_card_gets.get(card_id) is done:
+                        del self._inflight_card_gets[card_id]
+
+                task.add_done_callback(_forget)
+            # Shield so one caller going away does not cancel the shared fetch;
+            # deep copy so callers never mutate each other's card, tags or metadata
+            card = await asyncio.shield(task)
+            return card.model_copy(deep=True)
         except Exception as e:
             logger.error(f"Error fetching card {card_id}: {str(e)}")
             return None
@@ -206,32 +310,45 @@ class AnkiService:
         Update a card and record changes in edit history.
         """
         try:
-            card = await AnkiCard.get(card_id)
-            if not card:
-                raise InvalidInputError(f"Card {card_id} not found")
+            fields: Dict[str, Any] = {}
+            if front is not None:
+                fields["front"] = AnkiCard.fields_must_not_be_empty(front)
+            if back is not None:
+                fields["back"] = AnkiCard.fields_must_not_be_empty(back)
+            if notes is not None:
+                fields["notes"] = notes
+            if tags is not None:
+                fields["tags"] = tags
+            
+            if not fields:
+                return await AnkiCard.get(card_id)
+            
+            # Write and read back both states in one round trip; the write is
+            # skipped entirely when every field already matches
+            states = await AnkiCard.patch_with_previous(
+                card_id, fields, only_if_changed=True
+            )
+            if not states:
+                # Nothing changed, or the card is missing (get raises NotFoundError)
+                return await AnkiCard.get(card_id)
+            previous, card = states
             
             # Track changes for history
             changes: Dict[str, Dict[str, Any]] = {}
-            if front is not None and front != card.front:
-                changes["front"] = {"old": card.front, "new": front}
-                card.front = front
-            if back is not None and back != card.back:
-                changes["back"] = {"old": card.back, "new": back}
-                card.back = back
-            if notes is not None and notes != card.notes:
-                changes["notes"] = {"old": card.notes, "new": notes}
-                card.notes = notes
-            if tags is not None:
-                changes["tags"] = {"old": card.tags, "new": tags}
-                card.tags = tags
+            for field_name, new_value in fields.items():
+                old_value = getattr(previous, field_name)
+                if field_name == "tags" or new_value != old_value:
+                    changes[field_name] = {"old": old_value, "new": new_value}
             
             if changes:
-                await card.add_edit_history(changes, user_id)
-                await AnkiCardEdit.cleanup_old_history(card_id, keep_count=10)
+                await previous.add_edit_history(changes, user_id)
+                # Trimming old history is not user-visible; keep it off the response path
+                self._schedule_history_cleanup(card_id)
             
-            await card.save()
             logger.info(f"Updated card: {card_id}")
             return card
+        except (InvalidInputError, NotFoundError):
+            raise
         except Exception as e:
             logger.error(f"Error updating card {card_id}: {str(e)}")
             raise DatabaseOperationError(e)
@@ -239,31 +356,33 @@ class AnkiService:
     async def delete_card(self, card_id: str) -> bool:
         """Delete a card and its associated files."""
         try:
-            card = await AnkiCard.get(card_id)
-            if not card:
+            deleted = await self._delete_cards([card_id])
+            if not deleted:
                 return False
-            
-            # Cleanup associated files
-            if card.audio_metadata and card.audio_metadata.reference_mp3:
-                self._cleanup_file(card.audio_metadata.reference_mp3)
-            
-            if card.image_metadata and card.image_metadata.cached_path:
-                self._cleanup_file(card.image_metadata.cached_path)
-            
-            await card.delete()
             logger.info(f"Deleted card: {card_id}")
             return True
         except Exception as e:
             logger.error(f"Error deleting card {card_id}: {str(e)}")
             return False
 
+    async def _delete_cards(self, card_ids: List[str]) -> List[AnkiCard]:
+        """Delete cards in one query, then remove their audio and image files."""
+        deleted = await AnkiCard.bulk_delete(card_ids)
+        await self._cleanup_files(
+            path
+            for card in deleted
+            for path in (
+                card.audio_metadata.reference_mp3 if card.audio_metadata else None,
+                card.image_metadata.cached_path if card.image_metadata else None,
+            )
+        )
+        return deleted
+
     async def get_cards_by_deck(self, deck_id: str) -> List[AnkiCard]:
         """Get all cards in a deck."""
         try:
-            deck = await AnkiDeck.get(deck_id)
-            if not deck:
-                return []
-            return await deck.get_cards()
+            # An unknown deck simply has no cards; skip the existence lookup
+            return await AnkiCard.find_by_deck(deck_id)
         except Exception as e:
             logger.error(f"Error fetching cards for deck {deck_id}: {str(e)}")
             return []
@@ -271,10 +390,7 @@ class AnkiService:
     async def get_cards_by_session(self, session_id: str) -> List[AnkiCard]:
         """Get all cards in an export session."""
         try:
-            session = await AnkiExportSession.get(session_id)
-            if not session:
-                return []
-            return await session.get_cards()
+            return await AnkiCard.find_by_session(session_id)
         except Exception as e:
             logger.error(f"Error fetching cards for session {session_id}: {str(e)}")
             return []
@@ -286,8 +402,12 @@ class AnkiService:
         try:
             deck = AnkiDeck(name=name, description=description, tags=tags or [])
             await deck.save()
+            _deck_cache[str(deck.id)] = deck.model_copy(deep=True)
+            _deck_list_cache.clear()
             logger.info(f"Created deck: {deck.id}")
             return deck
+        except (InvalidInputError, NotFoundError):
+            raise
         except Exception as e:
             logger.error(f"Error creating deck: {str(e)}")
             raise DatabaseOperationError(e)
@@ -295,7 +415,7 @@ class AnkiService:
     async def get_deck(self, deck_id: str) -> Optional[AnkiDeck]:
         """Get a deck by ID."""
         try:
-            return await AnkiDeck.get(deck_id)
+            return await self._get_deck_cached(deck_id)
         except Exception as e:
             logger.error(f"Error fetching deck {deck_id}: {str(e)}")
             return None
@@ -303,7 +423,15 @@ class AnkiService:
     async def get_all_decks(self) -> List[AnkiDeck]:
         """Get all decks."""
         try:
-            return await AnkiDeck.get_all()
+            decks = _deck_list_cache.get("all")
+            if decks is None:
+                decks = await AnkiDeck.get_all()
+                _deck_list_cache["all"] = [deck.model_copy(deep=True) for deck in decks]
+                # Seed the per-deck cache so follow-up lookups skip the DB too
+                for deck in decks:
+                    _deck_cache[str(deck.id)] = deck.model_copy(deep=True)
+                return decks
+            return [deck.model_copy(deep=True) for deck in decks]
         except Exception as e:
             logger.error(f"Error fetching all decks: {str(e)}")
             return []
@@ -317,22 +445,36 @@ class AnkiService:
             delete_cards: If True, also delete all cards in the deck
         """
         try:
-            deck = await AnkiDeck.get(deck_id)
+            deck = await self._get_deck_cached(deck_id)
             if not deck:
                 return False
             
             if delete_cards:
                 cards = await deck.get_cards()
-                for card in cards:
-                    await self.delete_card(str(card.id))
+                deleted = await self._delete_cards([str(card.id) for card in cards])
+                logger.info(f"Deleted {len(deleted)} cards from deck {deck_id}")
             
             await deck.delete()
+            self._forget_deck(deck_id)
             logger.info(f"Deleted deck: {deck_id}")
             return True
         except Exception as e:
             logger.error(f"Error deleting deck {deck_id}: {str(e)}")
             return False
 
+    async def save_deck(self, deck: AnkiDeck) -> AnkiDeck:
+        """Save changes to a deck, dropping any cached copy of it."""
+        try:
+            await deck.save()
+            self._forget_deck(str(deck.id))
+            logger.info(f"Saved deck: {deck.id}")
+            return deck
+        except (InvalidInputError, NotFoundError):
+            raise
+        except Exception as e:
+            logger.error(f"Error saving deck {deck.id}: {str(e)}")
+            raise DatabaseOperationError(e)
+
     # ===== Export Session Operations =====
 
     async def create_export_session(
@@ -357,8 +499,11 @@ class AnkiService:
                 status="draft",
             )
             await session.save()
+            _session_cache[str(session.id)] = session.model_copy(deep=True)
             logger.info(f"Created export session: {session.id}")
             return session
+        except (InvalidInputError, NotFoundError):
+            raise
         except Exception as e:
             logger.error(f"Error creating export session: {str(e)}")
             raise DatabaseOperationError(e)
@@ -366,7 +511,7 @@ class AnkiService:
     async def get_export_session(self, session_id: str) -> Optional[AnkiExportSession]:
         """Get an export session by ID."""
         try:
-            return await AnkiExportSession.get(session_id)
+            return await self._get_session_cached(session_id)
         except Exception as e:
             logger.error(f"Error fetching export session {session_id}: {str(e)}")
             return None
@@ -379,6 +524,33 @@ class AnkiService:
             logger.error(f"Error fetching all export sessions: {str(e)}")
             return []
 
+    async def save_export_session(self, session: AnkiExportSession) -> AnkiExportSession:
+        """Save changes to an export session (e.g. status), dropping any cached copy."""
+        try:
+            await session.save()
+            _session_cache.pop(str(session.id), None)
+            logger.info(f"Saved export session: {session.id}")
+            return session
+        except (InvalidInputError, NotFoundError):
+            raise
+        except Exception as e:
+            logger.error(f"Error saving export session {session.id}: {str(e)}")
+            raise DatabaseOperationError(e)
+
+    async def delete_export_session(self, session_id: str) -> bool:
+        """Delete an export session and drop any cached copy of it."""
+        try:
+            session = await self._get_session_cached(session_id)
+            if not session:
+                return False
+            await session.delete()
+            _session_cache.pop(session_id, None)
+            logger.info(f"Deleted export session: {session_id}")
+            return True
+        except Exception as e:
+            logger.error(f"Error deleting export session {session_id}: {str(e)}")
+            return False
+
     # ===== Audio Management =====
 
     async def set_card_audio(
@@ -389,23 +561,18 @@ class AnkiService:
     ) -> AnkiCard:
         """Set audio metadata for a card."""
         try:
-            card = await AnkiCard.get(card_id)
-            if not card:
-                raise InvalidInputError(f"Card {card_id} not found")
-            
-            expires_at = datetime.utcnow() + timedelta(days=30)
-            
-            audio_metadata = AudioMetadata(
-                reference_mp3=reference_mp3_path,
-                audio_expires_at=expires_at,
-                ipa_transcriptions=[ipa_transcription] if ipa_transcription else [],
+            card = await AnkiCard.set_audio(
+                card_id,
+                reference_mp3_path,
+                [ipa_transcription] if ipa_transcription else [],
             )
-            
-            card.audio_metadata = audio_metadata
-            await card.save()
+            if not card:
+                raise NotFoundError(f"Card {card_id} not found")
             
             logger.info(f"Set audio for card {card_id}: {reference_mp3_path}")
             return card
+        except (InvalidInputError, NotFoundError):
+            raise
         except Exception as e:
             logger.error(f"Error setting audio for card {card_id}: {str(e)}")
             raise DatabaseOperationError(e)
@@ -414,14 +581,13 @@ class AnkiService:
         """Get cards with expired audio."""
         try:
             if deck_id:
-                deck = await AnkiDeck.get(deck_id)
+                deck = await self._get_deck_cached(deck_id)
                 if deck:
                     return await deck.get_expired_audio_cards()
                 return []
             else:
                 # Get all cards with expired audio
-                all_cards = await AnkiCard.get_all()
-                return [card for card in all_cards if card.is_audio_expired()]
+                return await AnkiCard.get_expired_audio()
         except Exception as e:
             logger.error(f"Error fetching expired audio cards: {str(e)}")
             return []
@@ -435,15 +601,14 @@ class AnkiService:
     ) -> AnkiCard:
         """Set image metadata for a card."""
         try:
-            card = await AnkiCard.get(card_id)
+            card = await AnkiCard.patch(card_id, {"image_metadata": image_metadata})
             if not card:
-                raise InvalidInputError(f"Card {card_id} not found")
-            
-            card.image_metadata = image_metadata
-            await card.save()
+                raise NotFoundError(f"Card {card_id} not found")
             
             logger.info(f"Set image for card {card_id}")
             return card
+        except (InvalidInputError, NotFoundError):
+            raise
         except Exception as e:
             logger.error(f"Error setting image for card {card_id}: {str(e)}")
             raise DatabaseOperationError(e)
@@ -459,36 +624,79 @@ class AnkiService:
     ) -> AnkiCard:
         """Set CEFR classification for a card."""
         try:
-            card = await AnkiCard.get(card_id)
+            # Level, votes and the level tag are written in one UPDATE
+            card = await AnkiCard.set_cefr(card_id, cefr_level, confidence, votes)
             if not card:
-                raise InvalidInputError(f"Card {card_id} not found")
-            
-            card.cefr_level = cefr_level
-            card.cefr_confidence = confidence
-            card.cefr_votes = votes
-            
-            # Add CEFR level to tags
-            if cefr_level and cefr_level not in card.tags:
-                card.tags.append(cefr_level)
-            
-            await card.save()
+                raise NotFoundError(f"Card {card_id} not found")
             logger.info(f"Set CEFR {cefr_level} for card {card_id}")
             return card
+        except (InvalidInputError, NotFoundError):
+            raise
         except Exception as e:
             logger.error(f"Error setting CEFR for card {card_id}: {str(e)}")
             raise DatabaseOperationError(e)
 
     # ===== Utility Methods =====
 
-    def _cleanup_file(self, file_path: str):
-        """Delete a file if it exists."""
-        try:
-            path = Path(file_path)
-            if path.exists():
-                path.unlink()
-                logger.info(f"Deleted file: {file_path}")
-        except Exception as e:
-            logger.warning(f"Error deleting file {file_path}: {str(e)}")
+    @classmethod
+    def _run_in_background(cls, coro: Coroutine[Any, Any, Any]) -> None:
+        """Schedule a coroutine without awaiting it, keeping a reference until done."""
+        task = asyncio.create_task(coro)
+        cls._background_tasks.add(task)
+        task.add_done_callback(cls._background_tasks.discard)
+
+    @classmethod
+    def _schedule_history_cleanup(cls, card_id: str) -> None:
+        """Trim a card's edit history in the background, unless a trim is already queued."""
+        if card_id in cls._pending_history_cleanups:
+            return
+        cls._pending_history_cleanups.add(card_id)
+
+        async def _cleanup() -> None:
+            try:
+                await AnkiCardEdit.cleanup_old_history(card_id, keep_count=10)
+            finally:
+                cls._pending_history_cleanups.discard(card_id)
+
+        cls._run_in_background(_cleanup())
+
+    @staticmethod
+    async def _get_deck_cached(deck_id: str) -> Optional[AnkiDeck]:
+        """Fetch a deck, serving repeat lookups from the TTL cache."""
+        deck = _deck_cache.get(deck_id)
+        if deck is not None:
+            return deck.model_copy(deep=True)
+        deck = await AnkiDeck.get(deck_id)
+        if deck:
+            _deck_cache[deck_id] = deck.model_copy(deep=True)
+        return deck
+
+    @staticmethod
+    def _forget_deck(deck_id: str) -> None:
+        """Drop a deck from the lookup caches after it was written or deleted."""
+        _deck_cache.pop(deck_id, None)
+        _deck_list_cache.clear()
+
+    @staticmethod
+    async def _get_session_cached(session_id: str) -> Optional[AnkiExportSession]:
+        """Fetch an export session, serving repeat lookups from the TTL cache."""
+        session = _session_cache.get(session_id)
+        if session is not None:
+            return session.model_copy(deep=True)
+        session = await AnkiExportSession.get(session_id)
+        if session:
+            _session_cache[session_id] = session.model_copy(deep=True)
+        return session
+
+    async def _cleanup_files(self, file_paths: Iterable[Optional[str]]) -> None:
+        """Delete files concurrently off the event loop, skipping empty paths and duplicates."""
+        paths = list(dict.fromkeys(path for path in file_paths if path))
+        for start in range(0, len(paths), _CLEANUP_CHUNK_SIZE):
+            chunk = paths[start:start + _CLEANUP_CHUNK_SIZE]
+            await asyncio.gather(
+                *(asyncio.to_thread(_unlink_if_exists, path) for path in chunk),
+                return_exceptions=True,
+            )
 
     # ===== AI Card Generation =====
 
@@ -511,8 +719,6 @@ class AnkiService:
         Returns:
             Dictionary with 'cards' list and 'model_used' string
         """
-        from ai_prompter import Prompter
-
         from open_notebook.domain.notebook import Source
         from open_notebook.graphs.utils import provision_langchain_model
         
@@ -521,25 +727,30 @@ class AnkiService:
             
             logger.info(f"Starting card generation for {len(source_ids)} sources")
             
-            # Fetch source content with full_text explicitly
-            sources = []
+            # Fetch all sources in one query; full_text is truncated server-side
+            fetched = await Source.get_many(source_ids, text_limit=5000)
+            fetched_ids = {str(source.id) for source in fetched}
             for source_id in source_ids:
-                logger.debug(f"Fetching source: {source_id}")
-                # Use Source.get() which properly fetches all fields
-                source = await Source.get(source_id)
-                logger.debug(f"Source fetched: {source_id}")
-                
-                if source and source.full_text:
-                    sources.append({
-                        "id": source.id,
-                        "title": source.title or "Untitled",
-                        "content": source.full_text[:5000]  # Limit to first 5000 chars
-                    })
-                    logger.debug(f"Source {source_id} added with {len(source.full_text)} chars of text")
+                if source_id not in fetched_ids:
+                    logger.warning(f"Source {source_id} not found")
+            
+            # Build context directly into one buffer instead of per-source dicts
+            context_buffer = io.StringIO()
+            sources_used = 0
+            for source in fetched:
+                if source.full_text:
+                    if sources_used:
+                        context_buffer.write("\n\n---\n\n")
+                    context_buffer.write("Source: ")
+                    context_buffer.write(source.title or "Untitled")
+                    context_buffer.write("\n")
+                    context_buffer.write(source.full_text)
+                    sources_used += 1
+                    logger.debug(f"Source {source.id} added with {len(source.full_text)} chars of text")
                 else:
-                    logger.warning(f"Source {source_id} has no full_text")
+                    logger.warning(f"Source {source.id} has no full_text")
             
-            if not sources:
+            if not sources_used:
                 raise InvalidInputError(
                     "No valid sources found with text content. "
                     "Selected sources may not have been processed yet, or they may be "
@@ -547,14 +758,10 @@ class AnkiService:
                     "Please wait for source processing to finish, or select text-based sources."
                 )
             
-            # Build context from sources
-            context_text = "\n\n---\n\n".join([
-                f"Source: {s['title']}\n{s['content']}"
-                for s in sources
-            ])
+            context_text = context_buffer.getvalue()
             
             # Create prompt for card generation
-            system_prompt = Prompter(prompt_template="anki_card_generation").render(data={
+            system_prompt = _card_generation_prompter().render(data={
                 "context": context_text,
                 "user_prompt": user_prompt,
                 "num_cards": num_cards
@@ -587,10 +794,9 @@ class AnkiService:
                 content = response.content if hasattr(response, 'content') else str(response)
                 
                 # Try to find JSON in the response
-                import re
-                json_match = re.search(r'\[.*\]', content, re.DOTALL)
+                json_match = _JSON_ARRAY_RE.search(content)
                 if json_match:
-                    cards_data = json.loads(json_match.group(0))
+                    cards_data = json_loads(json_match.group(0))
                 else:
                     # Fallback: parse as single card
                     cards_data = [{
@@ -630,10 +836,15 @@ class AnkiService:
                     "model_used": model_id or "default"
                 }
                 
+        except (InvalidInputError, NotFoundError):
+            raise
         except Exception as e:
             logger.error(f"Error generating cards with AI: {e}")
             raise DatabaseOperationError(e)
 
 
-# Global service instance
-anki_service = AnkiService()
+
+@functools.lru_cache(maxsize=1)
+def get_anki_service() -> AnkiService:
+    """Return the process-wide AnkiService, created on first use rather than at import."""
+    return AnkiService()
@@ -9,8 +9,13 @@ This service handles:
 """
 
 import asyncio
+import functools
 import hashlib
 import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta, timezone
 from typing import Any
 
@@ -26,23 +31,191 @@ except Exception:
 from pathlib import Path
 
 try:
-    from phonemizer import phonemize
+    from phonemizer.backend import EspeakBackend
+    _HAS_PHONEMIZER = True
 except Exception:
+    _HAS_PHONEMIZER = False
     # Fallback so the module can run in environments without phonemizer installed.
-    def phonemize(text, **kwargs):
-        return text
+    # It echoes the input text, which is not IPA and is never cached.
+    class EspeakBackend:  # type: ignore[no-redef]
+        def __init__(self, *a, **k):
+            pass
 
+        def phonemize(self, text, **kwargs):
+            return list(text)
 
-class EspeakBackend:
-    def __init__(self, *a, **k):
-        pass
-from typing import Optional, cast
+try:
+    from espeak_phonemizer import Phonemizer as EspeakPhonemizer
+except Exception:
+    # Opt-in lightweight libespeak-ng binding (`pip install espeak-phonemizer`);
+    # it is not a declared dependency, so phonemizer is used without it.
+    EspeakPhonemizer = None
+
+try:
+    from rapidfuzz.distance import Levenshtein
+except Exception:
+    # Opt-in C++ edit distance (`pip install rapidfuzz`); it is not a declared
+    # dependency, so default installs use the pure-Python implementation below.
+    Levenshtein = None
+from typing import Dict, List, Optional, Tuple, cast
 
-from api.anki_service import AnkiService
+from api.anki_service import get_anki_service
 from open_notebook.config import UPLOADS_FOLDER
 from open_notebook.domain.anki import AnkiCard, AudioMetadata
 
 
+class _EspeakPhonemizerBackend:
+    """Adapts espeak_phonemizer to the batch phonemize() call used below."""
+    
+    def __init__(self, language: str):
+        self._phonemizer = EspeakPhonemizer(default_voice=language)
+    
+    def phonemize(self, texts: List[str], **kwargs) -> List[str]:
+        return [self._phonemizer.phonemize(text, keep_clause_breakers=False) for text in texts]
+
+
+# Name of the phonemizer in use; part of the disk cache key since the two
+# libraries format their IPA output slightly differently. "none" means only
+# the stand-in above is available and nothing it returns may be cached.
+if EspeakPhonemizer is not None:
+    _IPA_BACKEND = "espeak_phonemizer"
+elif _HAS_PHONEMIZER:
+    _IPA_BACKEND = "phonemizer"
+else:
+    _IPA_BACKEND = "none"
+
+# espeak backends are expensive to start; build one per language and reuse it
+_phonemizer_backends: Dict[str, Any] = {}
+
+
+def _get_phonemizer_backend(language: str) -> Any:
+    """Return the cached espeak backend for a language, creating it on first use."""
+    backend = _phonemizer_backends.get(language)
+    if backend is None:
+        if EspeakPhonemizer is not None:
+            backend = _EspeakPhonemizerBackend(language)
+        else:
+            backend = EspeakBackend(
+                language=language,
+                with_stress=True,
+                preserve_punctuation=False,
+            )
+        _phonemizer_backends[language] = backend
+    return backend
+
+
+# IPA memo keyed on (text, language); card texts repeat constantly
+_IPA_CACHE_SIZE = 4096
+_ipa_cache: "OrderedDict[Tuple[str, str], str]" = OrderedDict()
+
+# Second-level IPA cache on disk so stable reference texts survive restarts
+# and are shared between the API and the command worker
+_IPA_DB_PATH = Path(UPLOADS_FOLDER) / "anki_data" / "ipa_cache.sqlite"
+_ipa_db: Optional[sqlite3.Connection] = None
+_ipa_db_lock = threading.Lock()
+
+
+def _ipa_db_key(text: str, language: str) -> str:
+    return hashlib.sha1(f"{_IPA_BACKEND}\x00{language}\x00{text}".encode()).hexdigest()
+
+
+def _get_ipa_db() -> Optional[sqlite3.Connection]:
+    """Open the on-disk IPA cache on first use; None if it cannot be opened."""
+    global _ipa_db
+    if _ipa_db is None:
+        try:
+            _IPA_DB_PATH.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(_IPA_DB_PATH, timeout=5.0, check_same_thread=False)
+            conn.execute("CREATE TABLE IF NOT EXISTS ipa (key TEXT PRIMARY KEY, ipa TEXT NOT NULL)")
+            _ipa_db = conn
+        except sqlite3.Error as e:
+            logger.warning(f"IPA disk cache unavailable: {e}")
+            return None
+    return _ipa_db
+
+
+def _load_ipa(texts: List[str], language: str) -> Dict[str, str]:
+    """Look texts up in the disk cache; errors degrade to a miss."""
+    keys = {_ipa_db_key(text, language): text for text in texts}
+    try:
+        with _ipa_db_lock:
+            conn = _get_ipa_db()
+            if conn is None:
+                return {}
+            placeholders = ",".join("?" * len(keys))
+            rows = conn.execute(
+                f"SELECT key, ipa FROM ipa WHERE key IN ({placeholders})", list(keys)
+            ).fetchall()
+    except sqlite3.Error as e:
+        logger.warning(f"IPA disk cache read failed: {e}")
+        return {}
+    return {keys[key]: ipa for key, ipa in rows}
+
+
+def _store_ipa(entries: Dict[str, str], language: str) -> None:
+    """Write freshly phonemized texts to the disk cache."""
+    try:
+        with _ipa_db_lock:
+            conn = _get_ipa_db()
+            if conn is None:
+                return
+            with conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO ipa (key, ipa) VALUES (?, ?)",
+                    [(_ipa_db_key(text, language), ipa) for text, ipa in entries.items()],
+                )
+    except sqlite3.Error as e:
+        logger.warning(f"IPA disk cache write failed: {e}")
+
+
+def _remember_ipa(text: str, language: str, ipa: str) -> None:
+    _ipa_cache[(text, language)] = ipa
+    if len(_ipa_cache) > _IPA_CACHE_SIZE:
+        _ipa_cache.popitem(last=False)
+
+
+# espeak backends and the memo are shared with worker threads (asyncio.to_thread)
+_ipa_lock = threading.Lock()
+
+
+def _texts_to_ipa(texts: List[str], language: str) -> List[str]:
+    """Phonemize strings with a single backend call, serving repeats from the caches."""
+    with _ipa_lock:
+        return _texts_to_ipa_locked(texts, language)
+
+
+def _texts_to_ipa_locked(texts: List[str], language: str) -> List[str]:
+    if _IPA_BACKEND == "none":
+        # Stand-in output is the raw text; keep it out of both caches so a
+        # later phonemizer install is not served stale "IPA"
+        phonemized = _get_phonemizer_backend(language).phonemize(list(texts), strip=True, njobs=1)
+        return [ipa.strip() for ipa in phonemized]
+    # Results are collected locally: remembering a large batch can evict
+    # entries from the bounded memo before they are read back
+    found: Dict[str, str] = {}
+    fresh: Dict[str, str] = {}
+    missing = []
+    for text in dict.fromkeys(texts):
+        key = (text, language)
+        if key in _ipa_cache:
+            _ipa_cache.move_to_end(key)
+            found[text] = _ipa_cache[key]
+        else:
+            missing.append(text)
+    if missing:
+        fresh.update(_load_ipa(missing, language))
+        missing = [text for text in missing if text not in fresh]
+    if missing:
+        phonemized = _get_phonemizer_backend(language).phonemize(missing, strip=True, njobs=1)
+        computed = {text: ipa.strip() for text, ipa in zip(missing, phonemized)}
+        _store_ipa(computed, language)
+        fresh.update(computed)
+    for text, ipa in fresh.items():
+        _remember_ipa(text, language, ipa)
+    found.update(fresh)
+    return [found[text] for text in texts]
+
+
 class AudioService:
     """Service for audio generation, transcription, and phonetic analysis."""
     
@@ -50,6 +223,34 @@ class AudioService:
     WHISPER_URL = os.getenv("WHISPER_API_URL", "http://whisper:9000")
     PIPER_URL = os.getenv("PIPER_API_URL", "http://piper:10200")
     
+    # Raw Wyoming protocol port; warmup skips Piper when PIPER_URL targets it
+    PIPER_WYOMING_PORT = 10200
+    
+    # Transcription language; empty lets Whisper auto-detect within the /asr call
+    WHISPER_LANGUAGE = os.getenv("WHISPER_LANGUAGE", "nl")
+    
+    # Per-endpoint request timeouts (seconds)
+    HTTP_TIMEOUTS = {"piper": 30.0, "whisper_asr": 60.0}
+    
+    # Shared keep-alive client for Piper/Whisper calls; see _get_http_client
+    _http: Optional[httpx.AsyncClient] = None
+    _http_loop: Optional[asyncio.AbstractEventLoop] = None
+    
+    # After a failed connect, fail fast for this many seconds instead of
+    # paying another connect timeout for every remaining card
+    PIPER_RETRY_AFTER = float(os.getenv("PIPER_RETRY_AFTER", "30"))
+    _piper_unavailable_until = 0.0
+    
+    # Upper bound on concurrent Piper requests during bulk regeneration
+    MAX_CONCURRENT_TTS = int(os.getenv("TTS_CONCURRENCY", "8"))
+    
+    # Similarities below this floor are reported as 0.0, which lets scoring
+    # stop early on hopeless attempts
+    MIN_PHONETIC_SCORE = float(os.getenv("MIN_PHONETIC_SCORE", "0.0"))
+    
+    # Read size when streaming synthesized audio to disk
+    STREAM_CHUNK_SIZE = 64 * 1024
+    
     # Audio settings
     AUDIO_FORMAT = "mp3"
     AUDIO_BITRATE = "128k"
@@ -60,13 +261,53 @@ class AudioService:
         logger.info("Initializing Audio service")
         self.audio_dir = Path(UPLOADS_FOLDER) / "anki_data" / "audio"
         self.audio_dir.mkdir(parents=True, exist_ok=True)
+    
+    @classmethod
+    def _get_http_client(cls) -> httpx.AsyncClient:
+        """Return the shared HTTP client, creating it for the running event loop.
         
-        # Initialize phonemizer backend
-        self.phonemizer_backend = EspeakBackend(
-            language="nl",  # Dutch
-            with_stress=True,
-            preserve_punctuation=False,
+        The client lives on the class so the warmup and shutdown classmethods
+        share it with the get_audio_service() instance; it is rebuilt if a
+        different event loop (e.g. a command worker) asks for it.
+        """
+        loop = asyncio.get_running_loop()
+        if cls._http is None or cls._http.is_closed or cls._http_loop is not loop:
+            cls._http = httpx.AsyncClient(
+                timeout=httpx.Timeout(60.0, connect=5.0),
+                limits=httpx.Limits(max_keepalive_connections=20, max_connections=100),
+            )
+            cls._http_loop = loop
+        return cls._http
+    
+    @classmethod
+    async def warmup(cls) -> None:
+        """Open keep-alive connections to Piper and Whisper ahead of first use.
+        
+        Any response (even an error status) leaves a pooled connection behind;
+        failures are ignored since the services may still be starting. Piper is
+        only probed when PIPER_URL points at the HTTP proxy: the Wyoming port
+        does not speak HTTP. A failed probe never opens the Piper fail-fast
+        window; only a real TTS request does that.
+        """
+        urls = [cls.WHISPER_URL]
+        if httpx.URL(cls.PIPER_URL).port != cls.PIPER_WYOMING_PORT:
+            urls.append(cls.PIPER_URL)
+        client = cls._get_http_client()
+        results = await asyncio.gather(
+            *(client.get(url, timeout=2.0) for url in urls),
+            return_exceptions=True,
         )
+        for url, result in zip(urls, results):
+            if isinstance(result, Exception):
+                logger.debug(f"Audio service warmup could not reach {url}: {result}")
+    
+    @classmethod
+    async def aclose(cls) -> None:
+        """Close the shared HTTP client (called on application shutdown)."""
+        if cls._http is not None and not cls._http.is_closed:
+            await cls._http.aclose()
+        cls._http = None
+        cls._http_loop = None
     
     async def generate_reference_audio(
         self,
@@ -89,7 +330,7 @@ class AudioService:
         logger.info(f"Generating reference audio for card {card_id}")
         
         # Generate IPA transcription
-        ipa = self._transcribe_to_ipa(text, language)
+        ipa = await asyncio.to_thread(self._transcribe_to_ipa, text, language)
         
         # Generate audio file using Piper
         audio_path = await self._generate_piper_audio(text, card_id, voice)
@@ -106,6 +347,26 @@ class AudioService:
         logger.info(f"Reference audio generated: {audio_path}")
         return metadata
     
+    @staticmethod
+    def _audio_filename(card_id: str, text: str) -> str:
+        """Reference audio filename: the card ID plus a short hash of the text."""
+        text_hash = hashlib.blake2b(text.encode(), digest_size=4).hexdigest()
+        return f"{card_id}_{text_hash}.mp3"
+    
+    @classmethod
+    def stored_reference_ipa(cls, card: AnkiCard, text: str) -> Optional[str]:
+        """Return the card's stored reference IPA if it was generated from `text`.
+        
+        The reference audio filename embeds a hash of the synthesized text, so a
+        match means the stored IPA is not stale after the card was edited.
+        """
+        audio_meta = card.audio_metadata
+        if not card.id or not audio_meta or not audio_meta.ipa_transcriptions:
+            return None
+        if Path(audio_meta.reference_mp3 or "").name != cls._audio_filename(card.id, text):
+            return None
+        return audio_meta.ipa_transcriptions[0]
+    
     async def _generate_piper_audio(
         self,
         text: str,
@@ -123,35 +384,50 @@ class AudioService:
             Path to generated audio file
         """
         # Create filename based on card ID and content hash
-        text_hash = hashlib.md5(text.encode()).hexdigest()[:8]
-        filename = f"{card_id}_{text_hash}.mp3"
-        output_path = self.audio_dir / filename
+        output_path = self.audio_dir / self._audio_filename(card_id, text)
         
         # If file already exists and is recent, return it
         if output_path.exists():
             logger.debug(f"Using cached audio: {output_path}")
             return output_path
         
+        if time.monotonic() < AudioService._piper_unavailable_until:
+            raise RuntimeError(f"Failed to generate audio: Piper at {self.PIPER_URL} is unreachable")
+        
+        # Stream into a temporary name so a partial download is never
+        # mistaken for a cached file by the exists() check above
+        part_path = output_path.with_name(f"{output_path.name}.part")
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                # Piper API expects JSON with text and voice
-                response = await client.post(
-                    f"{self.PIPER_URL}/api/tts",
-                    json={
-                        "text": text,
-                        "voice": voice,
-                        "output_format": "mp3"
-                    }
-                )
+            # Piper API expects JSON with text and voice
+            async with self._get_http_client().stream(
+                "POST",
+                f"{self.PIPER_URL}/api/tts",
+                json={
+                    "text": text,
+                    "voice": voice,
+                    "output_format": "mp3"
+                },
+                timeout=self.HTTP_TIMEOUTS["piper"],
+            ) as response:
                 response.raise_for_status()
                 
-                # Save audio file
-                output_path.write_bytes(response.content)
-                logger.debug(f"Generated audio via Piper: {output_path}")
-                
+                # Save audio file chunk by chunk
+                with open(part_path, "wb") as f:
+                    async for chunk in response.aiter_bytes(self.STREAM_CHUNK_SIZE):
+                        f.write(chunk)
+            os.replace(part_path, output_path)
+            logger.debug(f"Generated audio via Piper: {output_path}")
+            AudioService._piper_unavailable_until = 0.0
+            
+        except (httpx.ConnectError, httpx.ConnectTimeout) as e:
+            AudioService._piper_unavailable_until = time.monotonic() + self.PIPER_RETRY_AFTER
+            logger.error(f"Piper TTS unreachable, skipping requests for {self.PIPER_RETRY_AFTER:.0f}s: {e}")
+            raise RuntimeError(f"Failed to generate audio: {e}")
         except httpx.HTTPError as e:
             logger.error(f"Piper TTS failed: {e}")
             raise RuntimeError(f"Failed to generate audio: {e}")
+        finally:
+            part_path.unlink(missing_ok=True)
         
         return output_path
     
@@ -159,7 +435,8 @@ class AudioService:
         self,
         audio_file: Path,
         card_id: str,
-        reference_text: str
+        reference_text: str,
+        reference_ipa: Optional[str] = None
     ) -> tuple[str, str, float]:
         """Transcribe user recording and calculate phonetic score.
         
@@ -167,27 +444,44 @@ class AudioService:
             audio_file: Path to user's audio recording
             card_id: Card ID for saving
             reference_text: Expected text for comparison
+            reference_ipa: Stored IPA for reference_text, if already known
             
         Returns:
             Tuple of (transcribed_text, ipa_transcription, phonetic_score)
         """
         logger.info(f"Transcribing user recording for card {card_id}")
         
-        # Transcribe using Whisper
-        transcribed_text = await self._whisper_transcribe(audio_file)
-        
-        # Generate IPA for user's transcription
-        user_ipa = self._transcribe_to_ipa(transcribed_text)
+        if reference_ipa:
+            transcribed_text = await self._whisper_transcribe(audio_file)
+        else:
+            # Transcribe using Whisper; the reference IPA does not depend on it,
+            # so phonemize the reference in a thread while the request is in flight
+            transcribed_text, reference_ipa = await asyncio.gather(
+                self._whisper_transcribe(audio_file),
+                asyncio.to_thread(self._transcribe_to_ipa, reference_text),
+            )
         
-        # Generate IPA for reference text
-        reference_ipa = self._transcribe_to_ipa(reference_text)
+        # Generate IPA for the user's transcription
+        user_ipa = await asyncio.to_thread(self._transcribe_to_ipa, transcribed_text)
         
-        # Calculate phonetic distance (similarity score)
-        score = self._calculate_phonetic_score(user_ipa, reference_ipa)
+        # Calculate phonetic distance (similarity score); without rapidfuzz this
+        # is pure-Python work, so keep it off the event loop too
+        score = await asyncio.to_thread(self._calculate_phonetic_score, user_ipa, reference_ipa)
         
         logger.info(f"Transcription: '{transcribed_text}' | Score: {score:.2f}")
         return transcribed_text, user_ipa, score
     
+    def _whisper_asr_params(self) -> Dict[str, str]:
+        """Query parameters for the whisper-asr-webservice /asr endpoint.
+        
+        The service reads its options from the query string, not the form
+        body; a known language skips its separate detection pass.
+        """
+        params = {"task": "transcribe", "output": "json"}
+        if self.WHISPER_LANGUAGE:
+            params["language"] = self.WHISPER_LANGUAGE
+        return params
+    
     async def _whisper_transcribe(self, audio_file: Path) -> str:
         """Transcribe audio using Whisper service.
         
@@ -198,19 +492,21 @@ class AudioService:
             Transcribed text
         """
         try:
-            async with httpx.AsyncClient(timeout=60.0) as client:
-                with open(audio_file, "rb") as f:
-                    files = {"audio_file": (audio_file.name, f, "audio/mpeg")}
-                    response = await client.post(
-                        f"{self.WHISPER_URL}/asr",
-                        files=files,
-                        data={"language": "nl"}  # Dutch
-                    )
-                    response.raise_for_status()
-                    
-                    result = response.json()
-                    return result.get("text", "").strip()
-                    
+            # Read once off the event loop; a file object would be read
+            # synchronously by httpx while encoding the multipart body
+            audio_bytes = await asyncio.to_thread(audio_file.read_bytes)
+            files = {"audio_file": (audio_file.name, audio_bytes, "audio/mpeg")}
+            response = await self._get_http_client().post(
+                f"{self.WHISPER_URL}/asr",
+                files=files,
+                params=self._whisper_asr_params(),
+                timeout=self.HTTP_TIMEOUTS["whisper_asr"],
+            )
+            response.raise_for_status()
+            
+            result = response.json()
+            return result.get("text", "").strip()
+            
         except httpx.HTTPError as e:
             logger.error(f"Whisper transcription failed: {e}")
             raise RuntimeError(f"Failed to transcribe audio: {e}")
@@ -225,22 +521,27 @@ class AudioService:
         Returns:
             IPA transcription string
         """
+        return self._transcribe_batch_to_ipa([text], language)[0]
+    
+    def _transcribe_batch_to_ipa(self, texts: List[str], language: str = "nl") -> List[str]:
+        """Convert several texts to IPA with one phonemizer call.
+        
+        Args:
+            texts: Texts to transcribe
+            language: Language code (default: Dutch)
+            
+        Returns:
+            IPA transcriptions, in the same order as `texts`
+        """
         try:
-            # Use phonemizer to convert text to IPA
-            ipa = phonemize(
-                text,
-                language=language,
-                backend="espeak",
-                strip=True,
-                preserve_punctuation=False,
-                with_stress=True
-            )
-            return ipa.strip()
+            # Reuse the per-language espeak backend instead of phonemize(),
+            # which starts a new backend on every call
+            return _texts_to_ipa(texts, language)
             
         except Exception as e:
             logger.error(f"IPA transcription failed: {e}")
-            # Return original text as fallback
-            return text
+            # Return original texts as fallback
+            return list(texts)
     
     def _calculate_phonetic_score(
         self,
@@ -259,15 +560,30 @@ class AudioService:
         if not user_ipa or not reference_ipa:
             return 0.0
         
+        # Correct pronunciations usually transcribe identically
+        if user_ipa == reference_ipa:
+            return 1.0
+        
+        min_score = self.MIN_PHONETIC_SCORE
+        if Levenshtein is not None:
+            # Same 1 - distance / max_len similarity, computed in C++
+            return Levenshtein.normalized_similarity(
+                user_ipa, reference_ipa, score_cutoff=min_score or None
+            )
+        
+        # The length difference alone bounds the score from above; skip the
+        # DP when even that bound cannot reach the floor
+        max_len = max(len(user_ipa), len(reference_ipa))
+        if 1.0 - abs(len(user_ipa) - len(reference_ipa)) / max_len < min_score:
+            return 0.0
+        
         # Calculate Levenshtein distance
         distance = self._levenshtein_distance(user_ipa, reference_ipa)
         
         # Convert to similarity score (0.0 to 1.0)
-        max_len = max(len(user_ipa), len(reference_ipa))
-        if max_len == 0:
-            return 1.0
-        
         similarity = 1.0 - (distance / max_len)
+        if similarity < min_score:
+            return 0.0
         return max(0.0, min(1.0, similarity))  # Clamp to [0, 1]
     
     @staticmethod
@@ -281,24 +597,58 @@ class AudioService:
         Returns:
             Edit distance
         """
+        if Levenshtein is not None:
+            return Levenshtein.distance(s1, s2)
+        
+        # A shared prefix or suffix never changes the distance; attempts and
+        # references usually agree at the start and end, so trim them first
+        start = 0
+        limit = min(len(s1), len(s2))
+        while start < limit and s1[start] == s2[start]:
+            start += 1
+        end = 0
+        limit -= start
+        while end < limit and s1[-1 - end] == s2[-1 - end]:
+            end += 1
+        s1 = s1[start:len(s1) - end]
+        s2 = s2[start:len(s2) - end]
+        
+        # The shorter string is the bit-vector pattern, so the masks stay small
         if len(s1) < len(s2):
-            return AudioService._levenshtein_distance(s2, s1)
+            s1, s2 = s2, s1
         
-        if len(s2) == 0:
+        n = len(s2)
+        if n == 0:
             return len(s1)
         
-        previous_row = list(range(len(s2) + 1))
-        for i, c1 in enumerate(s1):
-            current_row = [i + 1]
-            for j, c2 in enumerate(s2):
-                # Cost of insertions, deletions, or substitutions
-                insertions = previous_row[j + 1] + 1
-                deletions = current_row[j] + 1
-                substitutions = previous_row[j] + (c1 != c2)
-                current_row.append(min(insertions, deletions, substitutions))
-            previous_row = current_row
-        
-        return previous_row[-1]
+        # Myers/Hyyrö bit-parallel edit distance: one DP column is packed into
+        # the vertical delta vectors vp/vn, updated per character of s1 with a
+        # handful of int operations instead of an inner loop over s2
+        peq: Dict[str, int] = {}
+        for i, c in enumerate(s2):
+            peq[c] = peq.get(c, 0) | (1 << i)
+        
+        mask = (1 << n) - 1
+        high = 1 << (n - 1)
+        vp = mask
+        vn = 0
+        distance = n
+        for c in s1:
+            eq = peq.get(c, 0)
+            xv = eq | vn
+            xh = (((eq & vp) + vp) ^ vp) | eq
+            hp = vn | (~(xh | vp) & mask)
+            hn = vp & xh
+            if hp & high:
+                distance += 1
+            elif hn & high:
+                distance -= 1
+            hp = ((hp << 1) | 1) & mask
+            hn = (hn << 1) & mask
+            vp = hn | (~(xv | hp) & mask)
+            vn = hp & xv
+        
+        return distance
     
     async def regenerate_expired_audio(
         self,
@@ -316,7 +666,7 @@ class AudioService:
         """
         logger.info(f"Regenerating expired audio (deck_id={deck_id}, all_decks={all_decks})")
         
-        anki_service = AnkiService()
+        anki_service = get_anki_service()
         
         if all_decks:
             # Get all decks
@@ -332,40 +682,50 @@ class AudioService:
             logger.warning("No deck specified for audio regeneration")
             return 0
         
-        # Regenerate audio for each card
-        regenerated_count = 0
-        for card in cards:
-            try:
-                # Ensure card has an ID
-                if not getattr(card, "id", None):
-                    logger.warning(f"Skipping card without id: {card}")
-                    continue
+        # Phonemize every card front in one batch; the per-card calls below hit the memo
+        await asyncio.to_thread(
+            self._transcribe_batch_to_ipa, [card.front or "" for card in cards]
+        )
+        
+        # Regenerate audio for each card, overlapping Piper round trips
+        semaphore = asyncio.Semaphore(self.MAX_CONCURRENT_TTS)
+        
+        async def _regenerate(card: AnkiCard) -> bool:
+            async with semaphore:
+                try:
+                    # Ensure card has an ID
+                    if not getattr(card, "id", None):
+                        logger.warning(f"Skipping card without id: {card}")
+                        return False
 
-                # Cast card.id to str for static type checker
-                card_id = cast(str, card.id)
+                    # Cast card.id to str for static type checker
+                    card_id = cast(str, card.id)
 
-                # Generate new audio
-                audio_metadata = await self.generate_reference_audio(
-                    text=card.front or "",
-                    card_id=card_id,
-                )
+                    # Generate new audio
+                    audio_metadata = await self.generate_reference_audio(
+                        text=card.front or "",
+                        card_id=card_id,
+                    )
 
-                # Update card with new audio (pass path and IPA string)
-                reference_path = getattr(audio_metadata, "reference_mp3", None)
-                ipa = None
-                if getattr(audio_metadata, "ipa_transcriptions", None):
-                    ipas = audio_metadata.ipa_transcriptions
-                    ipa = ipas[0] if isinstance(ipas, list) and len(ipas) > 0 else None
+                    # Update card with new audio (pass path and IPA string)
+                    reference_path = getattr(audio_metadata, "reference_mp3", None)
+                    ipa = None
+                    if getattr(audio_metadata, "ipa_transcriptions", None):
+                        ipas = audio_metadata.ipa_transcriptions
+                        ipa = ipas[0] if isinstance(ipas, list) and len(ipas) > 0 else None
 
-                if not reference_path:
-                    logger.error(f"Generated audio missing path for card {card.id}")
-                    continue
-                await anki_service.set_card_audio(card_id, reference_path, ipa_transcription=ipa)
-                regenerated_count += 1
-                
-            except Exception as e:
-                logger.error(f"Failed to regenerate audio for card {card.id}: {e}")
-                continue
+                    if not reference_path:
+                        logger.error(f"Generated audio missing path for card {card.id}")
+                        return False
+                    await anki_service.set_card_audio(card_id, reference_path, ipa_transcription=ipa)
+                    return True
+                    
+                except Exception as e:
+                    logger.error(f"Failed to regenerate audio for card {card.id}: {e}")
+                    return False
+        
+        results = await asyncio.gather(*(_regenerate(card) for card in cards))
+        regenerated_count = sum(results)
         
         logger.info(f"Regenerated {regenerated_count} audio files")
         return regenerated_count
@@ -378,21 +738,36 @@ class AudioService:
         """
         logger.info("Cleaning up expired audio files")
         
+        deleted_count = await asyncio.to_thread(self._delete_expired_files)
+        
+        logger.info(f"Deleted {deleted_count} expired audio files")
+        return deleted_count
+    
+    def _delete_expired_files(self) -> int:
+        """Unlink mp3 files older than the expiry window; blocking, run in a thread."""
         deleted_count = 0
-        expiry_threshold = datetime.now(timezone.utc)
+        cutoff = time.time() - self.AUDIO_EXPIRY_DAYS * 86400
         
-        # Iterate through all audio files
-        for audio_file in self.audio_dir.glob("*.mp3"):
-            # Check if file is old enough to be expired (older than expiry days)
-            file_age = datetime.now(timezone.utc) - datetime.fromtimestamp(audio_file.stat().st_mtime)
-            
-            if file_age > timedelta(days=self.AUDIO_EXPIRY_DAYS):
+        # scandir entries carry the stat result, so each file costs one syscall
+        with os.scandir(self.audio_dir) as entries:
+            for entry in entries:
+                if not entry.name.endswith(".mp3"):
+                    continue
                 try:
-                    audio_file.unlink()
+                    if entry.stat(follow_symlinks=False).st_mtime >= cutoff:
+                        continue
+                    os.unlink(entry.path)
                     deleted_count += 1
-                    logger.debug(f"Deleted expired audio: {audio_file}")
-                except Exception as e:
-                    logger.error(f"Failed to delete {audio_file}: {e}")
+                    logger.debug(f"Deleted expired audio: {entry.path}")
+                except FileNotFoundError:
+                    continue
+                except OSError as e:
+                    logger.error(f"Failed to delete {entry.path}: {e}")
         
-        logger.info(f"Deleted {deleted_count} expired audio files")
         return deleted_count
+
+
+@functools.lru_cache(maxsize=1)
+def get_audio_service() -> AudioService:
+    """Return the process-wide AudioService, created on first use rather than at import."""
+    return AudioService()
@@ -1,7 +1,12 @@
 """
 CEFR classification service with multi-model voting and RAG integration.
 """
+import asyncio
+import functools
 import json
+import re
+import time
+from itertools import islice
 from typing import Dict, List, Optional, Tuple
 
 from ai_prompter import Prompter
@@ -12,7 +17,17 @@ from open_notebook.database.repository import repo_query
 from open_notebook.domain.anki import CEFRVote, DutchWordFrequency
 from open_notebook.domain.models import model_manager
 from open_notebook.graphs.utils import provision_langchain_model
-from open_notebook.utils import clean_thinking_content
+from open_notebook.utils import clean_thinking_content, json_loads
+
+# A whitespace-delimited word with surrounding punctuation trimmed (the same
+# tokens as split() + strip(".,!?;:\"'"), minus punctuation-only ones)
+_WORD_RE = re.compile(r"""[^\s.,!?;:"']+(?:[.,!?;:"']+[^\s.,!?;:"']+)*""")
+
+
+@functools.lru_cache(maxsize=1)
+def _cefr_prompter() -> Prompter:
+    """Load and compile the CEFR classification template once per process."""
+    return Prompter(prompt_template="anki/cefr_classification")
 
 
 class CEFRService:
@@ -28,6 +43,17 @@ class CEFRService:
     - RAG context from sources tagged with #cefr-reference
     """
 
+    # In-memory copy of the most frequent words, word -> (rank, frequency);
+    # refreshed after the TTL so reloads of the frequency data show up
+    FREQUENCY_CACHE_MAX_WORDS = 100_000
+    FREQUENCY_CACHE_TTL = 3600.0
+    _frequency_table: Optional[Dict[str, Tuple[int, int]]] = None
+    _frequency_table_complete = False
+    _frequency_table_loaded_at = 0.0
+    # Guards reloads; created per event loop, see _get_frequency_table_lock
+    _frequency_table_lock: Optional[asyncio.Lock] = None
+    _frequency_table_lock_loop: Optional[asyncio.AbstractEventLoop] = None
+
     def __init__(self):
         logger.info("Initializing CEFR service")
         self.voting_models = []  # Will be configured from settings
@@ -85,14 +111,33 @@ class CEFRService:
     async def _get_word_frequency_info(self, text: str) -> Optional[str]:
         """Get word frequency information for words in text."""
         try:
-            words = text.lower().split()
             frequency_data = []
             
-            for word in words[:10]:  # Limit to first 10 words to avoid huge queries
-                word_clean = word.strip(".,!?;:\"'")
-                freq = await DutchWordFrequency.get_word_frequency(word_clean)
-                if freq:
-                    frequency_data.append(f"- '{word_clean}': rank {freq.rank}, frequency {freq.frequency}")
+            # Limit to first 10 words to avoid huge queries; the lazy scan stops
+            # there instead of splitting and lowercasing the whole text
+            words_clean = [match.group().lower() for match in islice(_WORD_RE.finditer(text), 10)]
+            
+            # Serve words from the in-memory table; only words it may be
+            # missing (table truncated or unavailable) go to the database
+            table = await self._load_frequency_table()
+            lookup: Dict[str, Tuple[int, int]] = {}
+            missing = words_clean
+            if table is not None:
+                lookup = {word: table[word] for word in words_clean if word in table}
+                missing = [] if self._frequency_table_complete else [
+                    word for word in words_clean if word not in table
+                ]
+            if missing:
+                frequencies = await DutchWordFrequency.get_word_frequencies(missing)
+                lookup.update(
+                    (word, (freq.rank, freq.frequency)) for word, freq in frequencies.items()
+                )
+            
+            for word_clean in words_clean:
+                entry = lookup.get(word_clean)
+                if entry:
+                    rank, frequency = entry
+                    frequency_data.append(f"- '{word_clean}': rank {rank}, frequency {frequency}")
             
             if frequency_data:
                 return "\n".join(frequency_data)
@@ -102,6 +147,47 @@ class CEFRService:
             logger.warning(f"Error getting word frequency: {str(e)}")
             return None
 
+    @classmethod
+    def _get_frequency_table_lock(cls) -> asyncio.Lock:
+        """Return the frequency table lock for the running event loop."""
+        loop = asyncio.get_running_loop()
+        if cls._frequency_table_lock is None or cls._frequency_table_lock_loop is not loop:
+            cls._frequency_table_lock = asyncio.Lock()
+            cls._frequency_table_lock_loop = loop
+        return cls._frequency_table_lock
+
+    @classmethod
+    async def _load_frequency_table(cls) -> Optional[Dict[str, Tuple[int, int]]]:
+        """Return the cached word frequency table, (re)loading it when stale."""
+        def fresh() -> bool:
+            return (
+                cls._frequency_table is not None
+                and time.monotonic() - cls._frequency_table_loaded_at < cls.FREQUENCY_CACHE_TTL
+            )
+        
+        if fresh():
+            return cls._frequency_table
+        async with cls._get_frequency_table_lock():
+            if fresh():
+                return cls._frequency_table
+            try:
+                rows = await repo_query(
+                    "SELECT word, rank, frequency FROM dutch_word_frequency ORDER BY rank LIMIT $limit",
+                    {"limit": cls.FREQUENCY_CACHE_MAX_WORDS},
+                )
+            except Exception as e:
+                logger.warning(f"Could not load word frequency table: {str(e)}")
+                return cls._frequency_table
+            
+            table: Dict[str, Tuple[int, int]] = {}
+            for row in rows:
+                table.setdefault(row["word"], (row["rank"], row["frequency"]))
+            cls._frequency_table = table
+            cls._frequency_table_complete = len(rows) < cls.FREQUENCY_CACHE_MAX_WORDS
+            cls._frequency_table_loaded_at = time.monotonic()
+            logger.info(f"Loaded {len(table)} Dutch word frequencies into memory")
+            return table
+
     async def _get_cefr_reference_context(self, text: str) -> Optional[str]:
         """
         Get relevant context from sources tagged with #cefr-reference.
@@ -147,48 +233,37 @@ class CEFRService:
         context_from_sources: Optional[str],
     ) -> List[CEFRVote]:
         """Collect votes from multiple models."""
-        votes = []
-        
         # Get configured models for CEFR classification
         # For now, use chat models - in production, configure specific models
         try:
             defaults = await model_manager.get_defaults()
             
             # Model 1: Default chat model (multilingual)
-            if defaults.default_chat_model:
-                vote = await self._get_model_vote(
-                    model_id=defaults.default_chat_model,
-                    text=text,
-                    word_frequency=word_frequency,
-                    context_from_sources=context_from_sources,
-                )
-                if vote:
-                    votes.append(vote)
-            
             # Model 2: Large context model (multilingual)
-            if defaults.large_context_model and defaults.large_context_model != defaults.default_chat_model:
-                vote = await self._get_model_vote(
-                    model_id=defaults.large_context_model,
-                    text=text,
-                    word_frequency=word_frequency,
-                    context_from_sources=context_from_sources,
-                )
-                if vote:
-                    votes.append(vote)
-            
             # Model 3: Transformation model (could be Dutch-native)
-            if defaults.default_transformation_model and defaults.default_transformation_model not in [
-                defaults.default_chat_model,
-                defaults.large_context_model,
-            ]:
-                vote = await self._get_model_vote(
-                    model_id=defaults.default_transformation_model,
+            # Each distinct model votes once; dict.fromkeys keeps this order
+            model_ids = [
+                model_id
+                for model_id in dict.fromkeys([
+                    defaults.default_chat_model,
+                    defaults.large_context_model,
+                    defaults.default_transformation_model,
+                ])
+                if model_id
+            ]
+            
+            # The votes are independent LLM round trips, so request them together;
+            # _get_model_vote logs its own failures and returns None
+            results = await asyncio.gather(*(
+                self._get_model_vote(
+                    model_id=model_id,
                     text=text,
                     word_frequency=word_frequency,
                     context_from_sources=context_from_sources,
                 )
-                if vote:
-                    votes.append(vote)
+                for model_id in model_ids
+            ))
+            votes = [vote for vote in results if vote]
             
             logger.info(f"Collected {len(votes)} votes for CEFR classification")
             return votes
@@ -213,9 +288,7 @@ class CEFRService:
                 "context_from_sources": context_from_sources,
             }
             
-            system_prompt = Prompter(prompt_template="anki/cefr_classification").render(
-                data=prompt_data
-            )
+            system_prompt = _cefr_prompter().render(data=prompt_data)
             
             # Get model response
             chain = await provision_langchain_model(
@@ -237,7 +310,7 @@ class CEFRService:
             )
             
             # Parse JSON response
-            result = json.loads(response_content)
+            result = json_loads(response_content)
             
             vote = CEFRVote(
                 model_id=model_id,
@@ -267,24 +340,24 @@ class CEFRService:
         if not votes:
             return "B1", 0.0
         
-        # Count weighted votes
-        level_weights: Dict[str, float] = {}
+        # Sum confidence and count votes per level in one pass
+        level_totals: Dict[str, List[float]] = {}
         for vote in votes:
-            level_weights[vote.level] = level_weights.get(vote.level, 0.0) + vote.confidence
+            totals = level_totals.setdefault(vote.level, [0.0, 0])
+            totals[0] += vote.confidence
+            totals[1] += 1
         
         # Find consensus level (highest weight)
-        consensus_level = max(level_weights.items(), key=lambda x: x[1])[0]
-        
-        # Calculate average confidence for consensus level
-        consensus_votes = [v for v in votes if v.level == consensus_level]
-        avg_confidence = sum(v.confidence for v in consensus_votes) / len(consensus_votes)
+        consensus_level, totals = max(level_totals.items(), key=lambda x: x[1][0])
         
-        # Adjust confidence based on agreement
-        agreement_factor = len(consensus_votes) / len(votes)
-        final_confidence = avg_confidence * agreement_factor
+        # Average confidence for the consensus level (weight / count), adjusted
+        # by agreement (count / len(votes)); the count cancels out
+        final_confidence = totals[0] / len(votes)
         
         return consensus_level, final_confidence
 
 
-# Global service instance
-cefr_service = CEFRService()
+@functools.lru_cache(maxsize=1)
+def get_cefr_service() -> CEFRService:
+    """Return the process-wide CEFRService, created on first use rather than at import."""
+    return CEFRService()
@@ -8,22 +8,67 @@ Supports:
 - Local image uploads
 - 7-day cache with 500MB LRU management
 """
+import asyncio
+import functools
 import hashlib
+import importlib.util
 import os
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Optional
+from typing import AsyncIterator, Optional, Tuple
 
 import httpx
 from loguru import logger
 
 from open_notebook.config import UPLOADS_FOLDER
 from open_notebook.domain.anki import ImageCache, ImageMetadata
+from open_notebook.exceptions import InvalidInputError
 
 
 class ImageService:
     """Service for fetching and caching images from external APIs."""
 
+    # Read size when streaming image downloads to disk
+    DOWNLOAD_CHUNK_SIZE = 64 * 1024
+    # Responses of these types are error pages, never images; anything else
+    # (including octet-stream or a missing header) is still cached
+    NON_IMAGE_CONTENT_TYPES = ("text/html",)
+    # Largest accepted image upload
+    MAX_UPLOAD_BYTES = 10 * 1024 * 1024
+
+    # Shared keep-alive client for provider APIs and image CDNs; see _get_http_client
+    _http: Optional[httpx.AsyncClient] = None
+    _http_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    # Recently used ImageCache rows by cache key, with the time they were
+    # fetched. Shared by all instances; entries are refetched after the TTL so
+    # the database access tracking that drives eviction stays current.
+    # None records a search the provider had no results for; it is not
+    # repeated until NEGATIVE_CACHE_TTL has passed, to spare the rate limits
+    MEM_CACHE_MAX_ENTRIES = 2048
+    MEM_CACHE_TTL = 3600.0
+    NEGATIVE_CACHE_TTL = 3600.0
+    _mem_cache: "OrderedDict[str, Tuple[Optional[ImageCache], float]]" = OrderedDict()
+
+    # Provider searches tried, in order of preference, by provider="any"
+    FANOUT_PROVIDERS = ("unsplash", "pexels", "pixabay")
+    # Bounds provider searches in flight across concurrent fan-outs; created
+    # per event loop like the HTTP client, see _get_search_semaphore
+    MAX_CONCURRENT_SEARCHES = 20
+    _search_semaphore: Optional[asyncio.BoundedSemaphore] = None
+    _search_semaphore_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    # LRU eviction runs once the estimated cache size passes the high-water
+    # mark and trims it to the low-water mark, rather than after every download
+    CACHE_HIGH_WATER = 0.95
+    CACHE_LOW_WATER = 0.80
+    # Expired cache files deleted concurrently per batch
+    UNLINK_BATCH_SIZE = 256
+    # Running estimate of the cache size in bytes, seeded from the database
+    _cache_bytes_estimate: Optional[int] = None
+
     def __init__(self):
         logger.info("Initializing Image service")
         self.cache_dir = Path(UPLOADS_FOLDER) / "anki_data" / "images" / "cache"
@@ -38,10 +83,53 @@ class ImageService:
         self.pexels_key = os.getenv("PEXELS_API_KEY")
         self.pixabay_key = os.getenv("PIXABAY_API_KEY")
         
+        # Per-provider auth, built once rather than on every search
+        self._unsplash_headers = {"Authorization": f"Client-ID {self.unsplash_key}"}
+        self._pexels_headers = {"Authorization": self.pexels_key or ""}
+        self._pixabay_params = {"key": self.pixabay_key, "per_page": 3, "image_type": "photo"}
+        
         # Cache settings
         self.max_cache_size = 500 * 1024 * 1024  # 500MB
         self.cache_expiry_days = 7
 
+    @classmethod
+    def _get_http_client(cls) -> httpx.AsyncClient:
+        """Return the shared HTTP client, creating it for the running event loop.
+        
+        HTTP/2 is opt-in: it is used only when h2 is installed (`pip install
+        httpx[http2]`), which default installs do not pull in. The transport
+        retries failed connects, which are common on cold CDN edges.
+        """
+        loop = asyncio.get_running_loop()
+        if cls._http is None or cls._http.is_closed or cls._http_loop is not loop:
+            cls._http = httpx.AsyncClient(
+                timeout=httpx.Timeout(30.0),
+                transport=httpx.AsyncHTTPTransport(
+                    http2=importlib.util.find_spec("h2") is not None,
+                    limits=httpx.Limits(max_keepalive_connections=20, max_connections=100),
+                    retries=3,
+                ),
+            )
+            cls._http_loop = loop
+        return cls._http
+
+    @classmethod
+    def _get_search_semaphore(cls) -> asyncio.BoundedSemaphore:
+        """Return the provider search semaphore for the running event loop."""
+        loop = asyncio.get_running_loop()
+        if cls._search_semaphore is None or cls._search_semaphore_loop is not loop:
+            cls._search_semaphore = asyncio.BoundedSemaphore(cls.MAX_CONCURRENT_SEARCHES)
+            cls._search_semaphore_loop = loop
+        return cls._search_semaphore
+
+    @classmethod
+    async def aclose(cls) -> None:
+        """Close the shared HTTP client (called on application shutdown)."""
+        if cls._http is not None and not cls._http.is_closed:
+            await cls._http.aclose()
+        cls._http = None
+        cls._http_loop = None
+
     async def search_image(
         self,
         query: str,
@@ -52,41 +140,134 @@ class ImageService:
         
         Args:
             query: Search query
-            provider: "unsplash", "pexels", or "pixabay"
+            provider: "unsplash", "pexels", "pixabay", or "any" to query
+                all three concurrently (see search_image_fanout)
         
         Returns:
             ImageMetadata with attribution and cached path, or None if not found
         """
         try:
-            # Check cache first
-            cache_key = self._generate_cache_key(query, provider)
-            cached_entry = await ImageCache.get_by_url(cache_key)
+            if provider == "any":
+                return await self.search_image_fanout(query)
             
-            if cached_entry and not self._is_expired(cached_entry):
-                logger.info(f"Using cached image for query: {query}")
-                return ImageMetadata(
-                    url=cached_entry.url,
-                    source=cached_entry.source,
-                    attribution_text=cached_entry.attribution,
-                    cached_path=cached_entry.cached_path,
-                    cache_expiry=cached_entry.expires_at,
-                )
+            # Check cache first
+            cached = await self._get_cached_image(query, provider)
+            if cached:
+                return cached
             
             # Fetch from API
-            if provider == "unsplash":
-                return await self._search_unsplash(query)
-            elif provider == "pexels":
-                return await self._search_pexels(query)
-            elif provider == "pixabay":
-                return await self._search_pixabay(query)
-            else:
-                logger.warning(f"Unknown provider: {provider}")
-                return None
+            return await self._search_provider(query, provider)
                 
         except Exception as e:
             logger.error(f"Error searching image: {str(e)}")
             return None
 
+    async def search_image_fanout(self, query: str) -> Optional[ImageMetadata]:
+        """
+        Search all providers concurrently and return the first image found.
+        
+        A fallback chain over the providers would cost one round trip per
+        provider that misses; here the slowest provider bounds the latency.
+        Cached results are still preferred, in FANOUT_PROVIDERS order.
+        """
+        cached = await asyncio.gather(*(
+            self._get_cached_image(query, provider) for provider in self.FANOUT_PROVIDERS
+        ))
+        for image in cached:
+            if image:
+                return image
+        
+        semaphore = self._get_search_semaphore()
+        
+        async def bounded(provider: str) -> Optional[ImageMetadata]:
+            async with semaphore:
+                return await self._search_provider(query, provider)
+        
+        tasks = [asyncio.create_task(bounded(provider)) for provider in self.FANOUT_PROVIDERS]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                # The provider searches log their own failures and return None
+                result = await next_done
+                if result:
+                    return result
+            logger.warning(f"No provider returned an image for: {query}")
+            return None
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _search_provider(self, query: str, provider: str) -> Optional[ImageMetadata]:
+        """Search one provider, unless it recently had no results for the query."""
+        searches = {
+            "unsplash": self._search_unsplash,
+            "pexels": self._search_pexels,
+            "pixabay": self._search_pixabay,
+        }
+        search = searches.get(provider)
+        if search is None:
+            logger.warning(f"Unknown provider: {provider}")
+            return None
+        
+        if self._has_no_results(self._generate_cache_key(query, provider)):
+            logger.info(f"Skipping {provider} search, no results recently for: {query}")
+            return None
+        return await search(query)
+
+    async def _get_cached_image(self, query: str, provider: str) -> Optional[ImageMetadata]:
+        """Return the cached image for a query and provider, unless expired."""
+        cached_entry = await self._get_cache_entry(self._generate_cache_key(query, provider))
+        if cached_entry and not self._is_expired(cached_entry):
+            logger.info(f"Using cached image for query: {query}")
+            return ImageMetadata(
+                url=cached_entry.url,
+                source=cached_entry.source,
+                attribution_text=cached_entry.attribution,
+                cached_path=cached_entry.cached_path,
+                cache_expiry=cached_entry.expires_at,
+            )
+        return None
+
+    @classmethod
+    async def _get_cache_entry(cls, cache_key: str) -> Optional[ImageCache]:
+        """Look up a cache entry, serving recent hits from memory."""
+        hit = cls._mem_cache.get(cache_key)
+        if hit is not None:
+            entry, fetched_at = hit
+            age = time.monotonic() - fetched_at
+            if entry is None:
+                # Known to have no results, so there is no row to look up
+                if age < cls.NEGATIVE_CACHE_TTL:
+                    cls._mem_cache.move_to_end(cache_key)
+                    return None
+            # evict_approx may have removed the file since it was remembered
+            elif age < cls.MEM_CACHE_TTL and os.path.exists(entry.cached_path):
+                cls._mem_cache.move_to_end(cache_key)
+                return entry
+            del cls._mem_cache[cache_key]
+        
+        entry = await ImageCache.get_by_url(cache_key)
+        if entry is not None:
+            cls._remember_cache_entry(cache_key, entry)
+        return entry
+
+    @classmethod
+    def _has_no_results(cls, cache_key: str) -> bool:
+        """Whether the provider recently returned no results for this cache key."""
+        hit = cls._mem_cache.get(cache_key)
+        return (
+            hit is not None
+            and hit[0] is None
+            and time.monotonic() - hit[1] < cls.NEGATIVE_CACHE_TTL
+        )
+
+    @classmethod
+    def _remember_cache_entry(cls, cache_key: str, entry: Optional[ImageCache]) -> None:
+        cls._mem_cache[cache_key] = (entry, time.monotonic())
+        cls._mem_cache.move_to_end(cache_key)
+        if len(cls._mem_cache) > cls.MEM_CACHE_MAX_ENTRIES:
+            cls._mem_cache.popitem(last=False)
+
     async def _search_unsplash(self, query: str) -> Optional[ImageMetadata]:
         """Search Unsplash for images."""
         if not self.unsplash_key:
@@ -94,44 +275,45 @@ class ImageService:
             return None
         
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    "https://api.unsplash.com/search/photos",
-                    params={"query": query, "per_page": 1},
-                    headers={"Authorization": f"Client-ID {self.unsplash_key}"},
-                    timeout=10.0,
-                )
-                response.raise_for_status()
-                data = response.json()
-                
-                if not data.get("results"):
-                    logger.warning(f"No Unsplash results for: {query}")
-                    return None
-                
-                photo = data["results"][0]
-                image_url = photo["urls"]["regular"]
-                attribution = f"Photo by {photo['user']['name']} on Unsplash"
-                
-                # Download and cache
-                cached_path = await self._download_and_cache(
-                    image_url=image_url,
-                    query=query,
-                    provider="unsplash",
-                    attribution=attribution,
-                )
-                
-                if not cached_path:
-                    return None
-                
-                return ImageMetadata(
-                    url=image_url,
-                    source="unsplash",
-                    license="Unsplash License",
-                    attribution_text=attribution,
-                    cached_path=cached_path,
-                    cache_expiry=datetime.now(timezone.utc) + timedelta(days=self.cache_expiry_days),
-                )
-                
+            client = self._get_http_client()
+            response = await client.get(
+                "https://api.unsplash.com/search/photos",
+                params={"query": query, "per_page": 1},
+                headers=self._unsplash_headers,
+                timeout=10.0,
+            )
+            response.raise_for_status()
+            data = response.json()
+            
+            if not data.get("results"):
+                logger.warning(f"No Unsplash results for: {query}")
+                self._remember_cache_entry(self._generate_cache_key(query, "unsplash"), None)
+                return None
+            
+            photo = data["results"][0]
+            image_url = photo["urls"]["regular"]
+            attribution = f"Photo by {photo['user']['name']} on Unsplash"
+            
+            # Download and cache
+            cached_path = await self._download_and_cache(
+                image_url=image_url,
+                query=query,
+                provider="unsplash",
+                attribution=attribution,
+            )
+            
+            if not cached_path:
+                return None
+            
+            return ImageMetadata(
+                url=image_url,
+                source="unsplash",
+                license="Unsplash License",
+                attribution_text=attribution,
+                cached_path=cached_path,
+                cache_expiry=datetime.now(timezone.utc) + timedelta(days=self.cache_expiry_days),
+            )
+            
         except Exception as e:
             logger.error(f"Error searching Unsplash: {str(e)}")
             return None
@@ -143,44 +325,45 @@ class ImageService:
             return None
         
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    "https://api.pexels.com/v1/search",
-                    params={"query": query, "per_page": 1},
-                    headers={"Authorization": self.pexels_key},
-                    timeout=10.0,
-                )
-                response.raise_for_status()
-                data = response.json()
-                
-                if not data.get("photos"):
-                    logger.warning(f"No Pexels results for: {query}")
-                    return None
-                
-                photo = data["photos"][0]
-                image_url = photo["src"]["large"]
-                attribution = f"Photo by {photo['photographer']} on Pexels"
-                
-                # Download and cache
-                cached_path = await self._download_and_cache(
-                    image_url=image_url,
-                    query=query,
-                    provider="pexels",
-                    attribution=attribution,
-                )
-                
-                if not cached_path:
-                    return None
-                
-                return ImageMetadata(
-                    url=image_url,
-                    source="pexels",
-                    license="Pexels License",
-                    attribution_text=attribution,
-                    cached_path=cached_path,
-                    cache_expiry=datetime.now(timezone.utc) + timedelta(days=self.cache_expiry_days),
-                )
-                
+            client = self._get_http_client()
+            response = await client.get(
+                "https://api.pexels.com/v1/search",
+                params={"query": query, "per_page": 1},
+                headers=self._pexels_headers,
+                timeout=10.0,
+            )
+            response.raise_for_status()
+            data = response.json()
+            
+            if not data.get("photos"):
+                logger.warning(f"No Pexels results for: {query}")
+                self._remember_cache_entry(self._generate_cache_key(query, "pexels"), None)
+                return None
+            
+            photo = data["photos"][0]
+            image_url = photo["src"]["large"]
+            attribution = f"Photo by {photo['photographer']} on Pexels"
+            
+            # Download and cache
+            cached_path = await self._download_and_cache(
+                image_url=image_url,
+                query=query,
+                provider="pexels",
+                attribution=attribution,
+            )
+            
+            if not cached_path:
+                return None
+            
+            return ImageMetadata(
+                url=image_url,
+                source="pexels",
+                license="Pexels License",
+                attribution_text=attribution,
+                cached_path=cached_path,
+                cache_expiry=datetime.now(timezone.utc) + timedelta(days=self.cache_expiry_days),
+            )
+            
         except Exception as e:
             logger.error(f"Error searching Pexels: {str(e)}")
             return None
@@ -192,43 +375,44 @@ class ImageService:
             return None
         
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    "https://pixabay.com/api/",
-                    params={"key": self.pixabay_key, "q": query, "per_page": 3, "image_type": "photo"},
-                    timeout=10.0,
-                )
-                response.raise_for_status()
-                data = response.json()
-                
-                if not data.get("hits"):
-                    logger.warning(f"No Pixabay results for: {query}")
-                    return None
-                
-                photo = data["hits"][0]
-                image_url = photo["largeImageURL"]
-                attribution = f"Image by {photo['user']} from Pixabay"
-                
-                # Download and cache
-                cached_path = await self._download_and_cache(
-                    image_url=image_url,
-                    query=query,
-                    provider="pixabay",
-                    attribution=attribution,
-                )
-                
-                if not cached_path:
-                    return None
-                
-                return ImageMetadata(
-                    url=image_url,
-                    source="pixabay",
-                    license="Pixabay License",
-                    attribution_text=attribution,
-                    cached_path=cached_path,
-                    cache_expiry=datetime.now(timezone.utc) + timedelta(days=self.cache_expiry_days),
-                )
-                
+            client = self._get_http_client()
+            response = await client.get(
+                "https://pixabay.com/api/",
+                params={**self._pixabay_params, "q": query},
+                timeout=10.0,
+            )
+            response.raise_for_status()
+            data = response.json()
+            
+            if not data.get("hits"):
+                logger.warning(f"No Pixabay results for: {query}")
+                self._remember_cache_entry(self._generate_cache_key(query, "pixabay"), None)
+                return None
+            
+            photo = data["hits"][0]
+            image_url = photo["largeImageURL"]
+            attribution = f"Image by {photo['user']} from Pixabay"
+            
+            # Download and cache
+            cached_path = await self._download_and_cache(
+                image_url=image_url,
+                query=query,
+                provider="pixabay",
+                attribution=attribution,
+            )
+            
+            if not cached_path:
+                return None
+            
+            return ImageMetadata(
+                url=image_url,
+                source="pixabay",
+                license="Pixabay License",
+                attribution_text=attribution,
+                cached_path=cached_path,
+                cache_expiry=datetime.now(timezone.utc) + timedelta(days=self.cache_expiry_days),
+            )
+            
         except Exception as e:
             logger.error(f"Error searching Pixabay: {str(e)}")
             return None
@@ -244,63 +428,121 @@ class ImageService:
         try:
             # Generate cache filename
             cache_key = self._generate_cache_key(query, provider)
-            filename = hashlib.md5(cache_key.encode()).hexdigest() + ".jpg"
+            filename = hashlib.blake2b(cache_key.encode("utf-8"), digest_size=16).hexdigest() + ".jpg"
             cached_path = self.cache_dir / filename
             
-            # Download image
-            async with httpx.AsyncClient() as client:
-                response = await client.get(image_url, timeout=30.0)
-                response.raise_for_status()
-                
-                # Save to cache
-                cached_path.write_bytes(response.content)
-                file_size = cached_path.stat().st_size
-                
-                # Store in database
-                cache_entry = ImageCache(
-                    url=cache_key,  # Use cache_key as unique identifier
-                    cached_path=str(cached_path),
-                    source=provider,
-                    attribution=attribution,
-                    file_size=file_size,
-                    expires_at=datetime.now(timezone.utc) + timedelta(days=self.cache_expiry_days),
-                )
-                await cache_entry.save()
-                
-                # Check cache size and cleanup if needed
-                await ImageCache.cleanup_lru(self.max_cache_size)
-                
-                logger.info(f"Cached image: {cached_path} ({file_size} bytes)")
-                return str(cached_path)
-                
+            # Download image, streaming it into a temporary name so a failed
+            # transfer never leaves a truncated file under the cache path
+            part_path = cached_path.with_name(f"{cached_path.name}.part")
+            file_size = 0
+            try:
+                client = self._get_http_client()
+                async with client.stream("GET", image_url, timeout=30.0) as response:
+                    response.raise_for_status()
+                    
+                    content_type = response.headers.get("content-type", "").lower()
+                    if content_type.startswith(self.NON_IMAGE_CONTENT_TYPES):
+                        logger.warning(f"Skipping non-image response ({content_type}) from {image_url}")
+                        return None
+                    
+                    # Save to cache chunk by chunk
+                    with open(part_path, "wb") as f:
+                        async for chunk in response.aiter_bytes(self.DOWNLOAD_CHUNK_SIZE):
+                            f.write(chunk)
+                            file_size += len(chunk)
+                os.replace(part_path, cached_path)
+            finally:
+                part_path.unlink(missing_ok=True)
+            
+            # Store in database
+            cache_entry = ImageCache(
+                url=cache_key,  # Use cache_key as unique identifier
+                cached_path=str(cached_path),
+                source=provider,
+                attribution=attribution,
+                file_size=file_size,
+                expires_at=datetime.now(timezone.utc) + timedelta(days=self.cache_expiry_days),
+            )
+            await cache_entry.save()
+            self._remember_cache_entry(cache_key, cache_entry)
+            
+            # Check cache size and cleanup if needed
+            await self._track_cache_size(file_size)
+            
+            logger.info(f"Cached image: {cached_path} ({file_size} bytes)")
+            return str(cached_path)
+            
         except Exception as e:
             logger.error(f"Error downloading and caching image: {str(e)}")
             return None
 
-    def save_uploaded_image(self, file_content: bytes, filename: str) -> Optional[str]:
+    async def _track_cache_size(self, added_bytes: int) -> None:
+        """Account for a new cache file and evict entries past the high-water mark."""
+        cls = type(self)
+        if cls._cache_bytes_estimate is None:
+            # The new entry is already saved, so the total includes it
+            cls._cache_bytes_estimate = await ImageCache.get_total_cache_size()
+        else:
+            cls._cache_bytes_estimate += added_bytes
+        
+        if cls._cache_bytes_estimate > self.CACHE_HIGH_WATER * self.max_cache_size:
+            cls._cache_bytes_estimate = await ImageCache.evict_approx(
+                int(self.CACHE_LOW_WATER * self.max_cache_size)
+            )
+
+    async def save_uploaded_image(
+        self,
+        chunks: AsyncIterator[bytes],
+        filename: str,
+        max_bytes: Optional[int] = None,
+    ) -> Optional[str]:
         """
         Save uploaded image to uploads directory.
         
+        The upload is written as it is read, so only one chunk is held in
+        memory at a time.
+        
         Args:
-            file_content: Image file bytes
+            chunks: Image file bytes, in chunks
             filename: Original filename
+            max_bytes: Size limit, defaults to MAX_UPLOAD_BYTES
         
         Returns:
             Path to saved file, or None on error
+        
+        Raises:
+            InvalidInputError: If the upload exceeds the size limit
         """
+        limit = self.MAX_UPLOAD_BYTES if max_bytes is None else max_bytes
+        upload_path: Optional[Path] = None
         try:
             # Generate safe filename
             safe_filename = self._sanitize_filename(filename)
             upload_path = self.uploads_dir / safe_filename
             
-            # Save file
-            upload_path.write_bytes(file_content)
+            # Save file, checking the size as it arrives rather than afterwards;
+            # the file I/O runs off the event loop
+            written = 0
+            f = await asyncio.to_thread(open, upload_path, "wb")
+            try:
+                async for chunk in chunks:
+                    written += len(chunk)
+                    if written > limit:
+                        raise InvalidInputError(f"Uploaded image exceeds {limit} bytes")
+                    await asyncio.to_thread(f.write, chunk)
+            finally:
+                await asyncio.to_thread(f.close)
             
-            logger.info(f"Saved uploaded image: {upload_path}")
+            logger.info(f"Saved uploaded image: {upload_path} ({written} bytes)")
             return str(upload_path)
             
+        except InvalidInputError:
+            upload_path.unlink(missing_ok=True)
+            raise
         except Exception as e:
             logger.error(f"Error saving uploaded image: {str(e)}")
+            if upload_path is not None:
+                upload_path.unlink(missing_ok=True)
             return None
 
     async def cleanup_expired_cache(self):
@@ -308,19 +550,30 @@ class ImageService:
         try:
             expired = await ImageCache.get_expired_entries()
             
+            # Delete files on worker threads, a batch at a time so a large
+            # backlog does not queue thousands of tasks at once; a file that is
+            # already gone is not an error
+            for start in range(0, len(expired), self.UNLINK_BATCH_SIZE):
+                batch = expired[start:start + self.UNLINK_BATCH_SIZE]
+                results = await asyncio.gather(
+                    *(
+                        asyncio.to_thread(Path(entry.cached_path).unlink, missing_ok=True)
+                        for entry in batch
+                    ),
+                    return_exceptions=True,
+                )
+                for entry, result in zip(batch, results):
+                    if isinstance(result, Exception):
+                        logger.warning(f"Error deleting cached file {entry.cached_path}: {str(result)}")
+            
+            # Delete database entries
+            await ImageCache.delete_many([entry.id for entry in expired if entry.id])
             for entry in expired:
-                # Delete file
-                try:
-                    path = Path(entry.cached_path)
-                    if path.exists():
-                        path.unlink()
-                except Exception as e:
-                    logger.warning(f"Error deleting cached file {entry.cached_path}: {str(e)}")
-                
-                # Delete database entry
-                await entry.delete()
+                self._mem_cache.pop(entry.url, None)
             
             if expired:
+                # Reseed the size estimate from the database on the next download
+                type(self)._cache_bytes_estimate = None
                 logger.info(f"Cleaned up {len(expired)} expired cache entries")
                 
         except Exception as e:
@@ -345,5 +598,7 @@ class ImageService:
         return f"{timestamp}_{filename}"
 
 
-# Global service instance
-image_service = ImageService()
+@functools.lru_cache(maxsize=1)
+def get_image_service() -> ImageService:
+    """Return the process-wide ImageService, created on first use rather than at import."""
+    return ImageService()
@@ -2,13 +2,16 @@
 from dotenv import load_dotenv
 load_dotenv()
 
+import asyncio
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from loguru import logger
 
+from api.audio_service import AudioService
 from api.auth import PasswordAuthMiddleware
+from api.image_service import ImageService
 from api.routers import (
     anki,
     auth,
@@ -71,10 +74,16 @@ async def lifespan(app: FastAPI):
 
     logger.success("API initialization completed successfully")
 
+    # Pre-open Piper/Whisper connections without delaying startup
+    audio_warmup = asyncio.create_task(AudioService.warmup())
+
     # Yield control to the application
     yield
 
     # Shutdown: cleanup if needed
+    audio_warmup.cancel()
+    await AudioService.aclose()
+    await ImageService.aclose()
     logger.info("API shutdown complete")
 
 
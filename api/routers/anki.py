@@ -10,10 +10,11 @@ Endpoints:
 - CEFR classification
 """
 
-from datetime import datetime
+import asyncio
+from datetime import datetime, timezone
 import os
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional
 
 import httpx
 from fastapi import (
@@ -29,11 +30,11 @@ from fastapi.responses import FileResponse
 from loguru import logger
 from pydantic import BaseModel, Field
 
-from api.anki_insights_service import anki_insights_service
-from api.anki_service import AnkiService
-from api.audio_service import AudioService
-from api.cefr_service import CEFRService
-from api.image_service import ImageService
+from api.anki_insights_service import AnkiInsightsService
+from api.anki_service import get_anki_service
+from api.audio_service import AudioService, get_audio_service
+from api.cefr_service import get_cefr_service
+from api.image_service import get_image_service
 from open_notebook.domain.anki import (
     AnkiCard,
     AnkiDeck,
@@ -42,10 +43,21 @@ from open_notebook.domain.anki import (
     CEFRVote,
     ImageMetadata,
 )
-from open_notebook.exceptions import InvalidInputError
+from open_notebook.exceptions import InvalidInputError, NotFoundError
 
 router = APIRouter(prefix="/anki", tags=["anki"])
 
+# Uploads are copied to disk in chunks of this size instead of read whole
+UPLOAD_CHUNK_SIZE = 64 * 1024
+# Largest accepted pronunciation recording
+MAX_RECORDING_BYTES = 10 * 1024 * 1024
+
+
+async def _iter_upload(file: UploadFile) -> AsyncIterator[bytes]:
+    """Yield an upload's content chunk by chunk."""
+    while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+        yield chunk
+
 
 # ============================================================================
 # Request/Response Models
@@ -115,7 +127,7 @@ class CardRatingRequest(BaseModel):
 async def create_card(request: CardCreateRequest):
     """Create a new flashcard."""
     try:
-        service = AnkiService()
+        service = get_anki_service()
         
         created_card = await service.create_card(
             front=request.front,
@@ -139,7 +151,7 @@ async def create_card(request: CardCreateRequest):
 async def get_card(card_id: str):
     """Get a card by ID."""
     try:
-        service = AnkiService()
+        service = get_anki_service()
         card = await service.get_card(card_id)
         
         if not card:
@@ -158,18 +170,9 @@ async def get_card(card_id: str):
 async def update_card(card_id: str, request: CardUpdateRequest):
     """Update an existing card."""
     try:
-        service = AnkiService()
-        
-        # Get existing card
-        card = await service.get_card(card_id)
-        if not card:
-            raise HTTPException(status_code=404, detail="Card not found")
+        service = get_anki_service()
         
-        # Update via service API (service handles persistence)
-        existing = await service.get_card(card_id)
-        if not existing:
-            raise HTTPException(status_code=404, detail="Card not found")
-
+        # The service reports a missing card itself; no pre-fetch needed
         updated_card = await service.update_card(
             card_id,
             front=request.front,
@@ -180,8 +183,8 @@ async def update_card(card_id: str, request: CardUpdateRequest):
         logger.info(f"Updated card: {card_id}")
         return updated_card
         
-    except HTTPException:
-        raise
+    except NotFoundError:
+        raise HTTPException(status_code=404, detail="Card not found")
     except InvalidInputError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
@@ -193,7 +196,7 @@ async def update_card(card_id: str, request: CardUpdateRequest):
 async def delete_card(card_id: str):
     """Delete a card."""
     try:
-        service = AnkiService()
+        service = get_anki_service()
         await service.delete_card(card_id)
         logger.info(f"Deleted card: {card_id}")
         
@@ -212,7 +215,7 @@ async def get_deck_cards(
 ):
     """Get all cards in a deck with pagination."""
     try:
-        service = AnkiService()
+        service = get_anki_service()
         deck = await service.get_deck(deck_id)
         
         if not deck:
@@ -243,7 +246,7 @@ async def create_deck(request: DeckCreateRequest):
     """Create a new deck."""
     try:
         logger.info(f"Received deck creation request: name={request.name}, tags={request.tags}")
-        service = AnkiService()
+        service = get_anki_service()
         
         created_deck = await service.create_deck(
             name=request.name,
@@ -266,7 +269,7 @@ async def create_deck(request: DeckCreateRequest):
 async def get_all_decks():
     """Get all decks."""
     try:
-        service = AnkiService()
+        service = get_anki_service()
         decks = await service.get_all_decks()
         
         return decks
@@ -280,7 +283,7 @@ async def get_all_decks():
 async def get_deck(deck_id: str):
     """Get a deck by ID."""
     try:
-        service = AnkiService()
+        service = get_anki_service()
         deck = await service.get_deck(deck_id)
         
         if not deck:
@@ -302,7 +305,7 @@ async def delete_deck(
 ):
     """Delete a deck (optionally with all cards)."""
     try:
-        service = AnkiService()
+        service = get_anki_service()
         await service.delete_deck(deck_id, delete_cards=delete_cards)
         logger.info(f"Deleted deck: {deck_id} (delete_cards={delete_cards})")
         
@@ -322,7 +325,7 @@ async def delete_deck(
 async def classify_cefr(request: CEFRClassifyRequest):
     """Classify text CEFR level using multi-model voting."""
     try:
-        service = CEFRService()
+        service = get_cefr_service()
         
         level, confidence, votes = await service.classify_text(request.text)
         
@@ -341,8 +344,8 @@ async def classify_cefr(request: CEFRClassifyRequest):
 async def set_card_cefr(card_id: str, request: CEFRClassifyRequest):
     """Classify and set CEFR level for a card."""
     try:
-        anki_service = AnkiService()
-        cefr_service = CEFRService()
+        anki_service = get_anki_service()
+        cefr_service = get_cefr_service()
         
         # Check card exists
         card = await anki_service.get_card(card_id)
@@ -385,7 +388,7 @@ async def set_card_cefr(card_id: str, request: CEFRClassifyRequest):
 async def search_image(request: ImageSearchRequest):
     """Search for an image using external APIs."""
     try:
-        service = ImageService()
+        service = get_image_service()
         
         image_meta = await service.search_image(
             query=request.query
@@ -405,17 +408,21 @@ async def upload_card_image(
 ):
     """Upload a custom image for a card."""
     try:
-        anki_service = AnkiService()
-        image_service = ImageService()
+        anki_service = get_anki_service()
+        image_service = get_image_service()
         
         # Check card exists
         card = await anki_service.get_card(card_id)
         if not card:
             raise HTTPException(status_code=404, detail="Card not found")
         
-        # Read uploaded file and save via ImageService
-        content = await file.read()
-        saved_path = image_service.save_uploaded_image(content, file.filename)
+        # Stream uploaded file to disk via ImageService
+        try:
+            saved_path = await image_service.save_uploaded_image(
+                _iter_upload(file), file.filename
+            )
+        except InvalidInputError as e:
+            raise HTTPException(status_code=413, detail=str(e))
         if not saved_path:
             raise HTTPException(status_code=500, detail="Failed to save uploaded image")
 
@@ -453,8 +460,8 @@ async def generate_card_audio(
 ):
     """Generate reference audio for a card."""
     try:
-        anki_service = AnkiService()
-        audio_service = AudioService()
+        anki_service = get_anki_service()
+        audio_service = get_audio_service()
         
         # Check card exists
         card = await anki_service.get_card(card_id)
@@ -494,29 +501,44 @@ async def transcribe_user_recording(
 ):
     """Transcribe user recording and score pronunciation."""
     try:
-        anki_service = AnkiService()
-        audio_service = AudioService()
+        anki_service = get_anki_service()
+        audio_service = get_audio_service()
         
         # Check card exists
         card = await anki_service.get_card(card_id)
         if not card:
             raise HTTPException(status_code=404, detail="Card not found")
         
-        # Save uploaded file temporarily
-        temp_path = Path(f"/tmp/{file.filename}")
-        with open(temp_path, "wb") as f:
-            content = await file.read()
-            f.write(content)
-        
-        # Transcribe and score
-        transcribed_text, ipa, score = await audio_service.transcribe_user_recording(
-            audio_file=temp_path,
-            card_id=card_id,
-            reference_text=reference_text
-        )
+        # Reuse the IPA stored with the reference audio instead of phonemizing
+        # the reference text again
+        reference_ipa = AudioService.stored_reference_ipa(card, reference_text)
         
-        # Clean up temp file
-        temp_path.unlink()
+        # Stream the recording to a temp file in chunks, then transcribe and
+        # score it, removing the temp file even if either step fails
+        temp_path = Path(f"/tmp/{file.filename}")
+        try:
+            written = 0
+            f = await asyncio.to_thread(open, temp_path, "wb")
+            try:
+                async for chunk in _iter_upload(file):
+                    written += len(chunk)
+                    if written > MAX_RECORDING_BYTES:
+                        raise HTTPException(
+                            status_code=413,
+                            detail=f"Recording exceeds {MAX_RECORDING_BYTES} bytes",
+                        )
+                    await asyncio.to_thread(f.write, chunk)
+            finally:
+                await asyncio.to_thread(f.close)
+            
+            transcribed_text, ipa, score = await audio_service.transcribe_user_recording(
+                audio_file=temp_path,
+                card_id=card_id,
+                reference_text=reference_text,
+                reference_ipa=reference_ipa
+            )
+        finally:
+            temp_path.unlink(missing_ok=True)
         
         return {
             "success": True,
@@ -541,14 +563,13 @@ async def transcribe_user_recording(
 async def create_export_session(request: ExportSessionCreateRequest):
     """Create a new export session."""
     try:
-        service = AnkiService()
+        service = get_anki_service()
         
-        # Get deck names for session naming
-        deck_names = []
-        for deck_id in request.deck_ids:
-            deck = await service.get_deck(deck_id)
-            if deck:
-                deck_names.append(deck.name)
+        # Get deck names for session naming; lookups are independent, so run them together
+        decks = await asyncio.gather(
+            *(service.get_deck(deck_id) for deck_id in request.deck_ids)
+        )
+        deck_names = [deck.name for deck in decks if deck]
         
         # Generate session name
         base_name = ", ".join(deck_names) if deck_names else "Export"
@@ -587,7 +608,7 @@ async def create_export_session(request: ExportSessionCreateRequest):
 async def get_export_session(session_id: str):
     """Get an export session by ID."""
     try:
-        service = AnkiService()
+        service = get_anki_service()
         session = await service.get_export_session(session_id)
         
         if not session:
@@ -666,46 +687,43 @@ async def get_anki_config_check():
 @router.post("/cards/{card_id}/rate")
 async def rate_card(card_id: str, request: CardRatingRequest):
     """Record a study rating (1-5) for a card."""
-    service = AnkiService()
+    service = get_anki_service()
     card = await service.get_card(card_id)
     if not card:
         raise HTTPException(status_code=404, detail="Card not found")
 
-    metadata = card.metadata or {}
+    now = datetime.now(timezone.utc).isoformat()
+    metadata = dict(card.metadata or {})
     history = metadata.get("study_history", [])
-    history.append({
-        "timestamp": datetime.utcnow().isoformat(),
-        "rating": request.rating,
-    })
-    metadata["study_history"] = history[-300:]
+    metadata["study_history"] = [*history, {"timestamp": now, "rating": request.rating}][-300:]
 
-    stats = metadata.get("study_stats", {})
+    stats = dict(metadata.get("study_stats", {}))
     stats["ratings_count"] = int(stats.get("ratings_count", 0)) + 1
     stats["last_rating"] = request.rating
-    stats["last_rated_at"] = datetime.utcnow().isoformat()
+    stats["last_rated_at"] = now
     metadata["study_stats"] = stats
 
-    card.metadata = metadata
-    await card.save()
+    # Write only the metadata object rather than re-saving the whole card
+    await AnkiCard.patch(card_id, {"metadata": metadata})
     return {"success": True}
 
 
 @router.post("/cards/{card_id}/study")
 async def record_card_study(card_id: str):
     """Record that a card was shown/reviewed in study mode."""
-    service = AnkiService()
+    service = get_anki_service()
     card = await service.get_card(card_id)
     if not card:
         raise HTTPException(status_code=404, detail="Card not found")
 
-    metadata = card.metadata or {}
-    stats = metadata.get("study_stats", {})
+    metadata = dict(card.metadata or {})
+    stats = dict(metadata.get("study_stats", {}))
     stats["views_count"] = int(stats.get("views_count", 0)) + 1
-    stats["last_viewed_at"] = datetime.utcnow().isoformat()
+    stats["last_viewed_at"] = datetime.now(timezone.utc).isoformat()
     metadata["study_stats"] = stats
 
-    card.metadata = metadata
-    await card.save()
+    # Write only the metadata object rather than re-saving the whole card
+    await AnkiCard.patch(card_id, {"metadata": metadata})
     return {"success": True}
 
 
@@ -831,7 +849,7 @@ async def get_prompt_presets():
 @router.post("/feedback/generation")
 async def submit_generation_feedback(request: GenerationFeedbackRequest):
     """Persist post-generation quality feedback for iterative prompt/process improvement."""
-    service = AnkiService()
+    service = get_anki_service()
     service.record_generation_feedback(
         rating=request.rating,
         feedback_text=request.feedback_text,
@@ -846,7 +864,7 @@ async def submit_generation_feedback(request: GenerationFeedbackRequest):
 
     return {
         "success": True,
-        "recorded_at": datetime.utcnow().isoformat(),
+        "recorded_at": datetime.now(timezone.utc).isoformat(),
         "message": "Feedback saved and will influence future generation guidance.",
     }
 
@@ -867,7 +885,7 @@ async def generate_cards_from_sources(
     logger.info(f"Request params: sources={request.source_ids}, num_cards={request.num_cards}")
     try:
         logger.info("Initializing AnkiService")
-        service = AnkiService()
+        service = get_anki_service()
         logger.info("AnkiService initialized")
         
         # Verify deck exists
@@ -938,7 +956,7 @@ async def get_source_anki_insights(source_id: str):
     into structured card data.
     """
     try:
-        insights_with_cards = await anki_insights_service.get_anki_insights_for_source(source_id)
+        insights_with_cards = await AnkiInsightsService.get_anki_insights_for_source(source_id)
         
         insights_data = []
         total_cards = 0
@@ -972,7 +990,7 @@ async def get_notebook_anki_insights(notebook_id: str):
     from all sources in the notebook, grouped by source.
     """
     try:
-        insights_with_cards = await anki_insights_service.get_anki_insights_for_notebook(notebook_id)
+        insights_with_cards = await AnkiInsightsService.get_anki_insights_for_notebook(notebook_id)
         
         # Group by source
         sources_dict: Dict[str, Any] = {}
@@ -1030,14 +1048,14 @@ async def create_cards_from_insight(
             raise HTTPException(status_code=404, detail="Insight not found")
         
         # Check if it's an Anki insight
-        if not anki_insights_service.is_anki_insight(insight.insight_type):
+        if not AnkiInsightsService.is_anki_insight(insight.insight_type):
             raise HTTPException(
                 status_code=400, 
                 detail=f"Insight type '{insight.insight_type}' is not an Anki card insight"
             )
         
         # Parse cards from insight
-        cards = anki_insights_service.parse_cards_from_insight(insight.content)
+        cards = AnkiInsightsService.parse_cards_from_insight(insight.content)
         if not cards:
             raise HTTPException(status_code=400, detail="No valid cards found in insight")
         
@@ -1046,12 +1064,9 @@ async def create_cards_from_insight(
             cards = [cards[i] for i in request.card_indices if 0 <= i < len(cards)]
         
         # Create the cards with media generation
-        anki_service = AnkiService()
-        from api.audio_service import AudioService
-        from api.image_service import ImageService
-        
-        image_service = ImageService()
-        audio_service = AudioService()
+        anki_service = get_anki_service()
+        image_service = get_image_service()
+        audio_service = get_audio_service()
         created_cards = []
         
         for card_data in cards:
@@ -14,10 +14,10 @@ from loguru import logger
 from pydantic import BaseModel
 from surreal_commands import CommandInput, CommandOutput, command
 
-from api.anki_service import AnkiService
-from api.audio_service import AudioService
-from api.cefr_service import CEFRService
-from api.image_service import ImageService
+from api.anki_service import get_anki_service
+from api.audio_service import get_audio_service
+from api.cefr_service import get_cefr_service
+from api.image_service import get_image_service
 from open_notebook.domain.anki import AnkiCard, AnkiDeck
 
 # ============================================================================
@@ -62,10 +62,10 @@ async def generate_anki_cards(
     try:
         logger.info(f"Generating cards for deck {input_data.deck_id}")
         
-        anki_service = AnkiService()
-        cefr_service = CEFRService()
-        image_service = ImageService()
-        audio_service = AudioService()
+        anki_service = get_anki_service()
+        cefr_service = get_cefr_service()
+        image_service = get_image_service()
+        audio_service = get_audio_service()
         
         # TODO: Use LLM with card_generation.jinja prompt to extract cards
         # For now, this is a placeholder showing the structure
@@ -204,7 +204,7 @@ async def regenerate_anki_audio(
             f"all_decks={input_data.all_decks})"
         )
         
-        audio_service = AudioService()
+        audio_service = get_audio_service()
         
         files_regenerated = await audio_service.regenerate_expired_audio(
             deck_id=input_data.deck_id,
@@ -268,8 +268,8 @@ async def reclassify_cefr_levels(
     try:
         logger.info("Starting CEFR reclassification")
         
-        anki_service = AnkiService()
-        cefr_service = CEFRService()
+        anki_service = get_anki_service()
+        cefr_service = get_cefr_service()
         
         # Determine which cards to reclassify
         cards = []
@@ -382,11 +382,11 @@ async def cleanup_anki_files(
         image_deleted = 0
         
         if input_data.cleanup_audio:
-            audio_service = AudioService()
+            audio_service = get_audio_service()
             audio_deleted = await audio_service.cleanup_expired_audio()
         
         if input_data.cleanup_images:
-            image_service = ImageService()
+            image_service = get_image_service()
             image_deleted = await image_service.cleanup_expired_cache()
         
         processing_time = time.time() - start_time
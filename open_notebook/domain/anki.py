@@ -1,8 +1,11 @@
 """
 Anki domain models for flashcard generation and management.
 """
+import asyncio
+import random
 from datetime import datetime, timedelta, timezone
-from typing import Any, ClassVar, Dict, List, Optional
+from pathlib import Path
+from typing import Any, ClassVar, Dict, List, Literal, Optional, Tuple
 
 from loguru import logger
 from pydantic import BaseModel, Field, field_validator
@@ -47,6 +50,15 @@ class AudioMetadata(BaseModel):
     ipa_transcriptions: List[str] = Field(default_factory=list)  # IPA for reference + recordings
 
 
+def _to_db_value(value: Any) -> Any:
+    """Convert nested pydantic models into plain data for a partial update"""
+    if isinstance(value, BaseModel):
+        return value.model_dump()
+    if isinstance(value, list):
+        return [_to_db_value(item) for item in value]
+    return value
+
+
 class AnkiCard(ObjectModel):
     """
     Anki flashcard with support for images, audio, CEFR levels, and source citations.
@@ -125,6 +137,196 @@ class AnkiCard(ObjectModel):
         if not self.audio_metadata or not self.audio_metadata.audio_expires_at:
             return False
         return datetime.now(timezone.utc) > self.audio_metadata.audio_expires_at
+    
+    @classmethod
+    async def patch(
+        cls,
+        card_id: str,
+        fields: Dict[str, Any],
+        returning: Literal["AFTER", "BEFORE"] = "AFTER",
+        only_if_changed: bool = False,
+    ) -> Optional["AnkiCard"]:
+        """
+        Merge fields into a card with a single UPDATE round trip.
+        
+        Returns the card as it was before or after the update (per `returning`),
+        or None if the card does not exist. With `only_if_changed`, the write is
+        skipped (and None returned) when every field already holds its new value.
+        """
+        result = await cls._merge(card_id, fields, returning, only_if_changed)
+        return AnkiCard(**result[0]) if result else None
+    
+    @classmethod
+    async def patch_with_previous(
+        cls,
+        card_id: str,
+        fields: Dict[str, Any],
+        only_if_changed: bool = False,
+    ) -> Optional[Tuple["AnkiCard", "AnkiCard"]]:
+        """
+        Like patch, but return both the (before, after) states of the card.
+        
+        The after state is the row the database stored, so it carries the new
+        `updated` timestamp and any value conversions.
+        """
+        result = await cls._merge(
+            card_id, fields, "$before AS before, $after AS after", only_if_changed
+        )
+        if not result:
+            return None
+        return AnkiCard(**result[0]["before"]), AnkiCard(**result[0]["after"])
+    
+    @classmethod
+    async def _merge(
+        cls,
+        card_id: str,
+        fields: Dict[str, Any],
+        returning: str,
+        only_if_changed: bool,
+    ) -> List[Dict[str, Any]]:
+        """Run the MERGE update behind patch and patch_with_previous."""
+        condition = ""
+        if only_if_changed:
+            condition = "WHERE " + " OR ".join(f"{key} != $data.{key}" for key in fields)
+        data = {key: _to_db_value(value) for key, value in fields.items()}
+        # Same format ObjectModel.save writes, so the field keeps one type
+        data["updated"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        try:
+            return await repo_query(
+                f"UPDATE $card_id MERGE $data {condition} RETURN {returning}",
+                {"card_id": ensure_record_id(card_id), "data": data},
+            )
+        except Exception as e:
+            logger.error(f"Error patching card {card_id}: {str(e)}")
+            raise DatabaseOperationError(e)
+    
+    @classmethod
+    async def set_cefr(
+        cls,
+        card_id: str,
+        level: str,
+        confidence: float,
+        votes: List[CEFRVote],
+    ) -> Optional["AnkiCard"]:
+        """Set CEFR classification and add the level to tags in a single UPDATE"""
+        level = cls.validate_cefr_level(level)
+        try:
+            result = await repo_query(
+                """
+                UPDATE $card_id SET
+                    cefr_level = $level,
+                    cefr_confidence = $confidence,
+                    cefr_votes = $votes,
+                    tags = array::union(tags ?? [], [$level]),
+                    updated = $updated
+                RETURN AFTER
+                """,
+                {
+                    "card_id": ensure_record_id(card_id),
+                    "updated": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                    "level": level,
+                    "confidence": confidence,
+                    "votes": _to_db_value(votes),
+                },
+            )
+            return AnkiCard(**result[0]) if result else None
+        except Exception as e:
+            logger.error(f"Error setting CEFR for card {card_id}: {str(e)}")
+            raise DatabaseOperationError(e)
+    
+    @classmethod
+    async def set_audio(
+        cls,
+        card_id: str,
+        reference_mp3: str,
+        ipa_transcriptions: List[str],
+    ) -> Optional["AnkiCard"]:
+        """Replace a card's audio metadata, with the 30-day expiry computed by the database"""
+        try:
+            result = await repo_query(
+                """
+                UPDATE $card_id SET
+                    audio_metadata = {
+                        reference_mp3: $reference_mp3,
+                        audio_expires_at: time::now() + 30d,
+                        user_recordings: [],
+                        phonetic_scores: [],
+                        ipa_transcriptions: $ipa_transcriptions
+                    },
+                    updated = $updated
+                RETURN AFTER
+                """,
+                {
+                    "card_id": ensure_record_id(card_id),
+                    "updated": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                    "reference_mp3": reference_mp3,
+                    "ipa_transcriptions": ipa_transcriptions,
+                },
+            )
+            return AnkiCard(**result[0]) if result else None
+        except Exception as e:
+            logger.error(f"Error setting audio for card {card_id}: {str(e)}")
+            raise DatabaseOperationError(e)
+    
+    @classmethod
+    async def get_expired_audio(cls, deck_id: Optional[str] = None) -> List["AnkiCard"]:
+        """Get cards whose audio has expired, optionally within one deck, filtered in the database"""
+        deck_filter = "AND deck_id = $deck_id" if deck_id else ""
+        try:
+            cards = await repo_query(
+                f"""
+                SELECT * FROM anki_card
+                WHERE audio_metadata.audio_expires_at != NONE
+                AND audio_metadata.audio_expires_at < time::now()
+                {deck_filter}
+                """,
+                {"deck_id": deck_id},
+            )
+            return [AnkiCard(**card) for card in cards] if cards else []
+        except Exception as e:
+            logger.error(f"Error fetching cards with expired audio: {str(e)}")
+            raise DatabaseOperationError(e)
+    
+    @classmethod
+    async def bulk_delete(cls, card_ids: List[str]) -> List["AnkiCard"]:
+        """Delete cards in a single DELETE and return them as they were before"""
+        if not card_ids:
+            return []
+        try:
+            cards = await repo_query(
+                "DELETE $card_ids RETURN BEFORE",
+                {"card_ids": [ensure_record_id(card_id) for card_id in card_ids]},
+            )
+            return [AnkiCard(**card) for card in cards] if cards else []
+        except Exception as e:
+            logger.error(f"Error bulk deleting {len(card_ids)} cards: {str(e)}")
+            raise DatabaseOperationError(e)
+    
+    @classmethod
+    async def find_by_deck(cls, deck_id: str) -> List["AnkiCard"]:
+        """Get all cards in a deck with one query, without loading the deck itself"""
+        try:
+            cards = await repo_query(
+                "SELECT * FROM anki_card WHERE deck_id = $deck_id ORDER BY created DESC",
+                {"deck_id": deck_id}  # Use string ID directly, not RecordID
+            )
+            return [AnkiCard(**card) for card in cards] if cards else []
+        except Exception as e:
+            logger.error(f"Error fetching cards for deck {deck_id}: {str(e)}")
+            raise DatabaseOperationError(e)
+    
+    @classmethod
+    async def find_by_session(cls, session_id: str) -> List["AnkiCard"]:
+        """Get all cards in an export session with one query, without loading the session itself"""
+        try:
+            cards = await repo_query(
+                "SELECT * FROM anki_card WHERE export_session_id = $session_id ORDER BY created DESC",
+                {"session_id": ensure_record_id(session_id)}
+            )
+            return [AnkiCard(**card) for card in cards] if cards else []
+        except Exception as e:
+            logger.error(f"Error fetching cards for export session {session_id}: {str(e)}")
+            raise DatabaseOperationError(e)
 
 
 class AnkiDeck(ObjectModel):
@@ -147,15 +349,7 @@ class AnkiDeck(ObjectModel):
     
     async def get_cards(self) -> List[AnkiCard]:
         """Get all cards in this deck"""
-        try:
-            cards = await repo_query(
-                "SELECT * FROM anki_card WHERE deck_id = $deck_id ORDER BY created DESC",
-                {"deck_id": self.id}  # Use string ID directly, not RecordID
-            )
-            return [AnkiCard(**card) for card in cards] if cards else []
-        except Exception as e:
-            logger.error(f"Error fetching cards for deck {self.id}: {str(e)}")
-            raise DatabaseOperationError(e)
+        return await AnkiCard.find_by_deck(self.id)
     
     async def get_card_count(self) -> int:
         """Get the number of cards in this deck"""
@@ -172,8 +366,7 @@ class AnkiDeck(ObjectModel):
     async def get_expired_audio_cards(self) -> List[AnkiCard]:
         """Get cards with expired audio in this deck"""
         try:
-            cards = await self.get_cards()
-            return [card for card in cards if card.is_audio_expired()]
+            return await AnkiCard.get_expired_audio(deck_id=self.id)
         except Exception as e:
             logger.error(f"Error fetching expired audio cards for deck {self.id}: {str(e)}")
             return []
@@ -210,15 +403,7 @@ class AnkiExportSession(ObjectModel):
     
     async def get_cards(self) -> List[AnkiCard]:
         """Get all cards in this export session"""
-        try:
-            cards = await repo_query(
-                "SELECT * FROM anki_card WHERE export_session_id = $session_id ORDER BY created DESC",
-                {"session_id": ensure_record_id(self.id)}
-            )
-            return [AnkiCard(**card) for card in cards] if cards else []
-        except Exception as e:
-            logger.error(f"Error fetching cards for export session {self.id}: {str(e)}")
-            raise DatabaseOperationError(e)
+        return await AnkiCard.find_by_session(self.id)
     
     async def get_card_count(self) -> int:
         """Get the number of cards in this session"""
@@ -300,6 +485,25 @@ class DutchWordFrequency(ObjectModel):
             logger.error(f"Error fetching frequency for word '{word}': {str(e)}")
             return None
     
+    @classmethod
+    async def get_word_frequencies(cls, words: List[str]) -> Dict[str, "DutchWordFrequency"]:
+        """Get frequency data for several words in one query, keyed by lowercased word"""
+        lowered = list(dict.fromkeys(word.lower() for word in words))
+        if not lowered:
+            return {}
+        try:
+            result = await repo_query(
+                "SELECT * FROM dutch_word_frequency WHERE word IN $words",
+                {"words": lowered}
+            )
+            frequencies: Dict[str, DutchWordFrequency] = {}
+            for row in result:
+                frequencies.setdefault(row["word"], DutchWordFrequency(**row))
+            return frequencies
+        except Exception as e:
+            logger.error(f"Error fetching frequencies for {len(lowered)} words: {str(e)}")
+            return {}
+    
     @classmethod
     async def bulk_insert(cls, words: List[Dict[str, Any]]):
         """Bulk insert word frequency data"""
@@ -361,6 +565,20 @@ class ImageCache(ObjectModel):
             logger.error(f"Error fetching expired cache entries: {str(e)}")
             return []
     
+    @classmethod
+    async def delete_many(cls, ids: List[str]) -> None:
+        """Delete several cache entries in one query"""
+        if not ids:
+            return
+        try:
+            await repo_query(
+                "DELETE image_cache WHERE id IN $ids",
+                {"ids": [ensure_record_id(record_id) for record_id in ids]}
+            )
+        except Exception as e:
+            logger.error(f"Error deleting {len(ids)} cache entries: {str(e)}")
+            raise DatabaseOperationError(e)
+    
     @classmethod
     async def get_total_cache_size(cls) -> int:
         """Get total size of cached images in bytes"""
@@ -374,35 +592,77 @@ class ImageCache(ObjectModel):
             return 0
     
     @classmethod
-    async def cleanup_lru(cls, max_size_bytes: int = 500 * 1024 * 1024):
+    async def evict_approx(cls, target_bytes: int, sample_size: int = 64) -> int:
         """
-        Cleanup cache using LRU eviction if over max_size (default 500MB).
+        Approximate LRU eviction: shrink the cache to at most target_bytes.
+        
+        Each round reads a window of sample_size rows at a random offset and
+        picks the least recently used eighth of it for eviction. Unlike ORDER BY,
+        a window never sorts or shuffles the whole table, and the hit rate stays
+        close to exact LRU. The chosen rows are deleted in one query and their
+        files unlinked on worker threads afterwards.
+        
+        Returns the cache size after eviction.
         """
+        total_size = await cls.get_total_cache_size()
+        evict_per_round = max(1, sample_size // 8)
+        freed_bytes = 0
         try:
-            total_size = await cls.get_total_cache_size()
-            if total_size <= max_size_bytes:
-                return
+            if total_size <= target_bytes:
+                return total_size
             
-            # Get entries sorted by last access (oldest first)
-            entries = await repo_query(
-                "SELECT * FROM image_cache ORDER BY last_accessed ASC"
-            )
+            result = await repo_query("SELECT count() AS total FROM image_cache GROUP ALL")
+            row_count = result[0]["total"] if result else 0
             
-            if not entries:
-                return
-            
-            bytes_to_free = total_size - max_size_bytes
-            freed_bytes = 0
-            
-            for entry_data in entries:
-                if freed_bytes >= bytes_to_free:
+            # total_size is only lowered once the rows are actually deleted
+            victims: Dict[str, ImageCache] = {}
+            remaining_size = total_size
+            while remaining_size > target_bytes and len(victims) < row_count:
+                sample = await repo_query(
+                    "SELECT * FROM image_cache LIMIT $limit START $start",
+                    {
+                        "limit": sample_size,
+                        "start": random.randrange(max(1, row_count - sample_size + 1)),
+                    },
+                )
+                # Rows stay in the table until the final delete, so later
+                # windows can overlap earlier picks
+                entries = sorted(
+                    (
+                        entry
+                        for entry in (ImageCache(**entry_data) for entry_data in sample)
+                        if entry.id and str(entry.id) not in victims
+                    ),
+                    key=lambda entry: entry.last_accessed,
+                )
+                if not entries:
                     break
                 
-                entry = ImageCache(**entry_data)
-                freed_bytes += entry.file_size
-                await entry.delete()
-                logger.info(f"Evicted cache entry: {entry.cached_path} ({entry.file_size} bytes)")
+                for entry in entries[:evict_per_round]:
+                    if remaining_size <= target_bytes:
+                        break
+                    victims[str(entry.id)] = entry
+                    remaining_size -= entry.file_size
+            
+            if victims:
+                await cls.delete_many(list(victims))
+                freed_bytes = total_size - remaining_size
+                total_size = remaining_size
+                results = await asyncio.gather(
+                    *(
+                        asyncio.to_thread(Path(entry.cached_path).unlink, missing_ok=True)
+                        for entry in victims.values()
+                    ),
+                    return_exceptions=True,
+                )
+                for entry, unlinked in zip(victims.values(), results):
+                    if isinstance(unlinked, Exception):
+                        logger.warning(f"Error deleting cached file {entry.cached_path}: {str(unlinked)}")
+                logger.info(f"Evicted {len(victims)} cache entries")
             
-            logger.info(f"Cache cleanup freed {freed_bytes} bytes")
+            if freed_bytes:
+                logger.info(f"Cache cleanup freed {freed_bytes} bytes")
+            return total_size
         except Exception as e:
-            logger.error(f"Error during LRU cache cleanup: {str(e)}")
+            logger.error(f"Error during approximate LRU cache cleanup: {str(e)}")
+            return total_size
@@ -171,6 +171,39 @@ class Source(ObjectModel):
             return str(value)
         return str(value) if value else None
 
+    @classmethod
+    async def get_many(
+        cls, ids: List[str], text_limit: Optional[int] = None
+    ) -> List["Source"]:
+        """
+        Fetch several sources in a single query, in the order of `ids`.
+
+        Only id, title and full_text are loaded. When text_limit is given,
+        full_text is truncated server-side so the rest is never transferred.
+        Unknown ids are skipped.
+        """
+        if not ids:
+            return []
+        full_text_expr = (
+            'string::slice(full_text ?? "", 0, $text_limit) AS full_text'
+            if text_limit
+            else "full_text"
+        )
+        try:
+            result = await repo_query(
+                f"SELECT id, title, {full_text_expr} FROM $ids",
+                {
+                    "ids": [ensure_record_id(id) for id in ids],
+                    "text_limit": text_limit,
+                },
+            )
+            by_id = {str(row["id"]): cls(**row) for row in result}
+            return [by_id[id] for id in ids if id in by_id]
+        except Exception as e:
+            logger.error(f"Error fetching sources {ids}: {str(e)}")
+            logger.exception(e)
+            raise DatabaseOperationError(e)
+
     async def get_status(self) -> Optional[str]:
         """Get the processing status of the associated command"""
         if not self.command:
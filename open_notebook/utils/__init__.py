@@ -6,6 +6,7 @@ To avoid circular imports, import functions directly:
 - from open_notebook.utils import split_text, token_count, compare_versions
 """
 
+from .json_utils import json_loads
 from .text_utils import (
     clean_thinking_content,
     parse_thinking_content,
@@ -30,5 +31,6 @@ __all__ = [
     "token_cost",
     "compare_versions",
     "get_installed_version",
-    "get_version_from_github"
+    "get_version_from_github",
+    "json_loads",
 ]
\ No newline at end of file
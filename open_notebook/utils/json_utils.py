@@ -0,0 +1,30 @@
+"""
+JSON utilities for Open Notebook.
+Uses orjson when it is installed and falls back to the stdlib json module.
+"""
+
+import json
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore[assignment]
+
+
+def json_loads(data: Union[str, bytes]) -> Any:
+    """
+    Deserialize a JSON document.
+
+    orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers can keep
+    catching json.JSONDecodeError regardless of which backend is active.
+
+    Args:
+        data (Union[str, bytes]): The JSON document to parse.
+
+    Returns:
+        Any: The parsed Python object.
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
@@ -6,24 +6,46 @@ Runs in a separate container and talks to the `piper` container on the compose n
 import http.server
 import json
 import socket
+import threading
+from typing import BinaryIO, Iterator, List, Tuple
 from urllib.parse import urlparse
 
 HOST = '0.0.0.0'
 PORT = 5000
 PIPER_HOST = 'piper'
 PIPER_PORT = 10200
+MAX_IDLE_CONNECTIONS = 4
+
+Connection = Tuple[socket.socket, BinaryIO]
+
+# Wyoming connections that finished a synthesis cleanly; Piper accepts further
+# requests on them, which saves a TCP handshake per card
+_idle_connections: List[Connection] = []
+_idle_lock = threading.Lock()
 
 class Handler(http.server.BaseHTTPRequestHandler):
-    def _set_headers(self, status=200, content_type='application/json'):
+    # HTTP/1.1 so audio can be sent with chunked framing: a stream that breaks
+    # off before the terminating chunk is seen as an error by the client,
+    # rather than as a short but complete mp3
+    protocol_version = 'HTTP/1.1'
+
+    def _send_json(self, status, body: bytes):
         self.send_response(status)
-        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
         self.end_headers()
+        self.wfile.write(body)
+
+    def _write_chunk(self, data: bytes):
+        if data:
+            self.wfile.write(b'%x\r\n%s\r\n' % (len(data), data))
 
     def do_POST(self):
         parsed = urlparse(self.path)
         if parsed.path != '/api/tts':
-            self._set_headers(404)
-            self.wfile.write(b'{}')
+            # The request body was not read; do not reuse the connection
+            self.close_connection = True
+            self._send_json(404, b'{}')
             return
         length = int(self.headers.get('Content-Length', 0))
         body = self.rfile.read(length)
@@ -32,75 +54,122 @@ class Handler(http.server.BaseHTTPRequestHandler):
             text = payload.get('text', '')
             voice = payload.get('voice', '')
         except Exception:
-            self._set_headers(400)
-            self.wfile.write(b'{"error":"invalid json"}')
+            self._send_json(400, b'{"error":"invalid json"}')
             return
 
         try:
-            audio = synthesize_wyoming(text=text, voice=voice)
+            chunks = synthesize_wyoming(text=text, voice=voice)
+            # Pull the first chunk before committing to a 200 so connection
+            # and protocol errors still surface as a 500
+            first = next(chunks, b'')
         except Exception as e:
-            self._set_headers(500)
-            self.wfile.write(json.dumps({'error': str(e)}).encode('utf-8'))
+            self._send_json(500, json.dumps({'error': str(e)}).encode('utf-8'))
             return
 
-        # Return audio bytes as an MP3
-        self._set_headers(200, 'audio/mpeg')
-        self.wfile.write(audio)
-
-def synthesize_wyoming(text: str, voice: str) -> bytes:
-    # connect to wyoming server
-    host = PIPER_HOST
-    port = PIPER_PORT
-    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-    sock.settimeout(10)
-    sock.connect((host, port))
-
-    header = {"type": "synthesize", "data": {"text": text, "voice": voice}}
-    header_line = json.dumps(header, ensure_ascii=False) + '\n'
-    sock.sendall(header_line.encode('utf-8'))
-
-    collected = bytearray()
-    def read_n(n: int) -> bytes:
-        buf = bytearray()
-        while len(buf) < n:
-            chunk = sock.recv(n - len(buf))
-            if not chunk:
-                break
-            buf.extend(chunk)
-        return bytes(buf)
+        # Stream audio chunks to the client as Piper produces them
+        self.send_response(200)
+        self.send_header('Content-Type', 'audio/mpeg')
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+        try:
+            self._write_chunk(first)
+            for chunk in chunks:
+                self._write_chunk(chunk)
+        except Exception as e:
+            # Drop the connection without the terminating chunk so the
+            # client fails the request instead of keeping a truncated clip
+            self.log_error('Piper stream failed: %s', e)
+            self.close_connection = True
+            return
+        self.wfile.write(b'0\r\n\r\n')
 
-    while True:
-        # read header line
-        header_bytes = bytearray()
-        while True:
-            ch = sock.recv(1)
-            if not ch:
-                break
-            if ch == b'\n':
-                break
-            header_bytes.extend(ch)
-        if not header_bytes:
-            break
-        hdr = json.loads(header_bytes.decode('utf-8'))
-        data_len = int(hdr.get('data_length', 0) or 0)
-        if data_len:
-            _ = read_n(data_len)
-        payload_len = int(hdr.get('payload_length', 0) or 0)
-        if payload_len:
-            payload = read_n(payload_len)
-            collected.extend(payload)
-        if hdr.get('type') == 'audio-stop':
-            break
+def _open_connection() -> Connection:
+    sock = socket.create_connection((PIPER_HOST, PIPER_PORT), timeout=10)
+    # Buffered reader: header lines and payloads are served from 8 KiB recv()s
+    # instead of one syscall per header byte
+    return sock, sock.makefile('rb', buffering=8192)
 
+def _close_connection(conn: Connection) -> None:
+    sock, reader = conn
+    reader.close()
     try:
         sock.shutdown(socket.SHUT_RDWR)
     except Exception:
         pass
     sock.close()
 
-    return bytes(collected)
+def _acquire_connection() -> Connection:
+    with _idle_lock:
+        if _idle_connections:
+            return _idle_connections.pop()
+    return _open_connection()
+
+def _release_connection(conn: Connection) -> None:
+    with _idle_lock:
+        if len(_idle_connections) < MAX_IDLE_CONNECTIONS:
+            _idle_connections.append(conn)
+            return
+    _close_connection(conn)
+
+def _send_request(conn: Connection, request: bytes) -> bytes:
+    """Send a request and return the first response header line."""
+    sock, reader = conn
+    sock.sendall(request)
+    line = reader.readline()
+    if not line:
+        raise ConnectionError('Piper closed the connection')
+    return line
+
+def synthesize_wyoming(text: str, voice: str) -> Iterator[bytes]:
+    """Yield audio payloads from Piper as they arrive, without buffering the utterance."""
+    header = {"type": "synthesize", "data": {"text": text, "voice": voice}}
+    header_line = json.dumps(header, ensure_ascii=False) + '\n'
+    request = header_line.encode('utf-8')
+
+    conn = _acquire_connection()
+    try:
+        line = _send_request(conn, request)
+    except OSError:
+        # A pooled connection may have been dropped by Piper; retry once fresh
+        _close_connection(conn)
+        conn = _open_connection()
+        try:
+            line = _send_request(conn, request)
+        except Exception:
+            _close_connection(conn)
+            raise
+
+    reader = conn[1]
+    completed = False
+    try:
+        while True:
+            # read header line
+            header_bytes = line.rstrip(b'\n')
+            if not header_bytes:
+                raise ConnectionError('Piper closed the connection before audio-stop')
+            hdr = json.loads(header_bytes.decode('utf-8'))
+            data_len = int(hdr.get('data_length', 0) or 0)
+            if data_len:
+                _ = reader.read(data_len)
+            payload_len = int(hdr.get('payload_length', 0) or 0)
+            if payload_len:
+                payload = reader.read(payload_len)
+                if len(payload) < payload_len:
+                    raise ConnectionError('Piper closed the connection mid-payload')
+                yield payload
+            if hdr.get('type') == 'audio-stop':
+                completed = True
+                break
+            line = reader.readline()
+    finally:
+        # Only a connection read up to audio-stop is in a clean state to reuse
+        if completed:
+            _release_connection(conn)
+        else:
+            _close_connection(conn)
 
 if __name__ == '__main__':
-    server = http.server.HTTPServer((HOST, PORT), Handler)
+    # One thread per request so a slow synthesis does not stall other callers
+    server = http.server.ThreadingHTTPServer((HOST, PORT), Handler)
     print('Piper HTTP proxy listening on', HOST, PORT)
     server.serve_forever()
@@ -10,11 +10,23 @@ This test suite covers:
 - Dutch word frequency lookups
 """
 
+import asyncio
+import os
+import re
+import time
 from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, patch
 
+import httpx
 import pytest
 from pydantic import ValidationError
 
+from api.anki_insights_service import AnkiInsightsService
+from api.anki_service import AnkiService
+from api import audio_service
+from api.audio_service import AudioService
+from api.cefr_service import CEFRService
+from open_notebook.database.repository import ensure_record_id
 from open_notebook.domain.anki import (
     AnkiCard,
     AnkiCardEdit,
@@ -159,6 +171,37 @@ class TestAnkiCardValidation:
         assert card.is_audio_expired() is False
 
 
+    @pytest.mark.asyncio
+    async def test_concurrent_get_card_callers_get_independent_copies(self):
+        """Test that callers sharing one card fetch do not share its lists and dicts."""
+        card = AnkiCard(id="anki_card:shared", deck_id="anki_deck:1", front="hond", back="dog", tags=["dier"])
+        service = AnkiService()
+        with patch.object(AnkiCard, "get", AsyncMock(return_value=card)) as get:
+            first, second = await asyncio.gather(
+                service.get_card("anki_card:shared"),
+                service.get_card("anki_card:shared"),
+            )
+        assert get.await_count == 1
+        first.tags.append("mutated")
+        assert second.tags == ["dier"]
+
+
+    @pytest.mark.asyncio
+    async def test_update_card_returns_the_stored_row(self):
+        """Test that update_card returns the after state from the database write."""
+        before = AnkiCard(id="anki_card:1", deck_id="anki_deck:1", front="hond", back="dog")
+        after = AnkiCard(
+            id="anki_card:1", deck_id="anki_deck:1", front="hond", back="the dog",
+            updated=datetime(2026, 1, 2, 3, 4, 5),
+        )
+        service = AnkiService()
+        with patch.object(AnkiCard, "patch_with_previous", AsyncMock(return_value=(before, after))), \
+                patch.object(AnkiCard, "add_edit_history", AsyncMock()) as history, \
+                patch.object(service, "_schedule_history_cleanup"):
+            card = await service.update_card("anki_card:1", back="the dog")
+        assert card is after
+        history.assert_awaited_once_with({"back": {"old": "dog", "new": "the dog"}}, None)
+
 # ============================================================================
 # TEST SUITE 2: AnkiDeck Validation
 # ============================================================================
@@ -197,6 +240,26 @@ class TestAnkiDeckValidation:
         with pytest.raises(InvalidInputError, match="Deck name cannot be empty"):
             AnkiDeck(name="   ")
 
+    @pytest.mark.asyncio
+    async def test_cached_deck_is_not_shared_between_callers(self):
+        """Test that mutating a fetched deck does not change the cached copy."""
+        deck = AnkiDeck(id="anki_deck:cached", name="Dutch Vocabulary", tags=["dutch"])
+        service = AnkiService()
+        with patch.object(AnkiDeck, "get", AsyncMock(return_value=deck)) as get:
+            first = await service.get_deck("anki_deck:cached")
+            first.tags.append("mutated")
+            first.name = "Changed"
+            second = await service.get_deck("anki_deck:cached")
+            assert get.await_count == 1
+            assert second.name == "Dutch Vocabulary"
+            assert second.tags == ["dutch"]
+
+            # Saving through the service drops the cached copy
+            with patch.object(AnkiDeck, "save", AsyncMock()):
+                await service.save_deck(first)
+            await service.get_deck("anki_deck:cached")
+            assert get.await_count == 2
+
 
 # ============================================================================
 # TEST SUITE 3: AnkiExportSession
@@ -243,6 +306,26 @@ class TestAnkiExportSession:
         assert session.include_images is False
         assert session.export_format == "json"
 
+    @pytest.mark.asyncio
+    async def test_cached_session_is_not_shared_between_callers(self):
+        """Test that session progress written by one caller is not served from cache."""
+        session = AnkiExportSession(id="anki_export_session:cached", name="Export (2025-12-09 14:30)")
+        service = AnkiService()
+        with patch.object(AnkiExportSession, "get", AsyncMock(return_value=session)) as get:
+            first = await service.get_export_session("anki_export_session:cached")
+            first.status = "exporting"
+            first.metadata["progress"] = 0.5
+            second = await service.get_export_session("anki_export_session:cached")
+            assert get.await_count == 1
+            assert second.status == "draft"
+            assert second.metadata == {}
+
+            # Saving through the service drops the cached copy
+            with patch.object(AnkiExportSession, "save", AsyncMock()):
+                await service.save_export_session(first)
+            await service.get_export_session("anki_export_session:cached")
+            assert get.await_count == 2
+
 
 # ============================================================================
 # TEST SUITE 4: CEFR Vote and Classification
@@ -274,6 +357,18 @@ class TestCEFRVote:
         )
         assert vote.reasoning is None
 
+    def test_calculate_consensus(self):
+        """Test weighted consensus level and agreement-adjusted confidence."""
+        votes = [
+            CEFRVote(model_id="a", level="B1", confidence=0.8),
+            CEFRVote(model_id="b", level="B1", confidence=0.6),
+            CEFRVote(model_id="c", level="C1", confidence=0.9),
+        ]
+        level, confidence = CEFRService()._calculate_consensus(votes)
+        assert level == "B1"
+        assert confidence == pytest.approx((0.8 + 0.6) / 2 * (2 / 3))
+        assert CEFRService()._calculate_consensus([]) == ("B1", 0.0)
+
 
 # ============================================================================
 # TEST SUITE 5: Source Citation
@@ -457,6 +552,28 @@ class TestImageCache:
         cache.last_accessed = datetime.now(timezone.utc)
         assert cache.access_count == 1
 
+    @pytest.mark.asyncio
+    async def test_evict_approx_deletes_victims_in_one_query(self, tmp_path):
+        """Test that approximate LRU eviction removes the oldest rows with one delete."""
+        now = datetime.now(timezone.utc)
+        rows = []
+        for i in range(4):
+            path = tmp_path / f"{i}.jpg"
+            path.write_bytes(b"x")
+            rows.append({
+                "id": f"image_cache:img{i}", "url": f"u{i}", "cached_path": str(path),
+                "source": "test", "attribution": "test", "file_size": 100,
+                "last_accessed": now - timedelta(hours=i),
+            })
+        repo_query = AsyncMock(side_effect=[[{"total": 4}], rows, rows])
+        with patch("open_notebook.domain.anki.repo_query", repo_query), \
+                patch.object(ImageCache, "get_total_cache_size", AsyncMock(return_value=400)), \
+                patch.object(ImageCache, "delete_many", AsyncMock()) as delete_many:
+            remaining = await ImageCache.evict_approx(target_bytes=200, sample_size=8)
+        assert remaining == 200
+        delete_many.assert_awaited_once_with(["image_cache:img3", "image_cache:img2"])
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["0.jpg", "1.jpg"]
+
 
 # ============================================================================
 # TEST SUITE 10: AnkiCardEdit
@@ -567,3 +684,184 @@ class TestAnkiIntegration:
         assert "A1" in levels
         assert "B1" in levels
         assert "C2" in levels
+
+
+# ============================================================================
+# TEST SUITE 12: Anki Insights Parsing
+# ============================================================================
+
+
+class TestAnkiInsights:
+    """Test suite for detecting and parsing Anki card insights."""
+
+    @pytest.mark.parametrize(
+        "insight_type",
+        [
+            "Anki Cards - Dutch A2",
+            "anki_dutch_b1",
+            "ANKI\tcards",
+            "Flashcards",
+            "cards - dutch",
+            "Card-Dutch",
+        ],
+    )
+    def test_is_anki_insight_matches(self, insight_type):
+        """Test that Anki transformation names are recognised."""
+        assert AnkiInsightsService.is_anki_insight(insight_type) is True
+
+    @pytest.mark.parametrize(
+        "insight_type",
+        ["Dense Summary", "Key Insights", "Dutch grammar notes", "Ankify", "cards for dutch"],
+    )
+    def test_is_anki_insight_rejects(self, insight_type):
+        """Test that other transformation names are not treated as Anki insights."""
+        assert AnkiInsightsService.is_anki_insight(insight_type) is False
+
+    @pytest.mark.parametrize(
+        "insight_type",
+        [
+            "card s-dutch",
+            "card\xa0s - dutch",
+            "ca rds - dutch",
+            "cards - du tch",
+            "anki",
+            "anki-dutch",
+            "cards -- dutch",
+            "Cards\u2003-\u2003Dutch",
+            "x cards -\n dutch y",
+            "dutch - cards",
+            "dutchcards-dutch",
+        ],
+    )
+    def test_is_anki_insight_agrees_with_original_patterns(self, insight_type):
+        """Test that the substring scan accepts exactly what the original regexes did."""
+        original = re.compile(r"anki[_\s]|flashcard|card[s]?\s*-\s*dutch", re.IGNORECASE)
+        expected = bool(original.search(insight_type))
+        assert AnkiInsightsService.is_anki_insight(insight_type) is expected
+
+    @pytest.mark.parametrize(
+        "content,expected",
+        [
+            ('  [{"front": "hond", "back": "dog"}]', [{"front": "hond", "back": "dog"}]),
+            ('\n{"front": "kat", "back": "cat"}', [{"front": "kat", "back": "cat"}]),
+            ('Here you go:\n```json\n[{"front": "huis", "back": "house"}]\n```', [{"front": "huis", "back": "house"}]),
+            ("No cards could be generated.", []),
+        ],
+    )
+    def test_parse_cards_from_insight(self, content, expected):
+        """Test parsing bare JSON, fenced JSON and prose insight content."""
+        assert AnkiInsightsService.parse_cards_from_insight(content) == expected
+
+
+    @pytest.mark.asyncio
+    async def test_insights_reuse_content_parsed_and_backfill_the_rest(self):
+        """Test that stored parsed cards are reused and freshly parsed rows are written back."""
+        stored = [{"front": "hond", "back": "dog"}]
+        rows = [
+            {"id": "source_insight:1", "insight_type": "Anki Cards", "content": "not json", "content_parsed": stored},
+            {"id": "source_insight:2", "insight_type": "Anki Cards", "content": '[{"front": "kat", "back": "cat"}]'},
+        ]
+        repo_query = AsyncMock(side_effect=[rows, []])
+        with patch("api.anki_insights_service.repo_query", repo_query), \
+                patch.object(AnkiInsightsService, "_store_parsed_enabled", True):
+            result = await AnkiInsightsService.get_anki_insights_for_source("source:1")
+            await asyncio.gather(*AnkiInsightsService._background_tasks)
+        assert [cards for _, cards in result] == [stored, [{"front": "kat", "back": "cat"}]]
+        items = repo_query.call_args_list[1].args[1]["items"]
+        assert [item["id"] for item in items] == [ensure_record_id("source_insight:2")]
+
+# ============================================================================
+# TEST SUITE 13: Phonetic Scoring
+# ============================================================================
+
+
+class TestPhoneticScoring:
+    """Test suite for pronunciation distance and similarity scoring."""
+
+    @pytest.mark.parametrize(
+        "s1,s2,expected",
+        [
+            ("", "", 0),
+            ("hond", "", 4),
+            ("kat", "kat", 0),
+            ("kitten", "sitting", 3),
+            ("ɦɔnt", "hɔnt", 1),
+        ],
+    )
+    def test_levenshtein_distance(self, s1, s2, expected):
+        """Test edit distance in both argument orders."""
+        assert AudioService._levenshtein_distance(s1, s2) == expected
+        assert AudioService._levenshtein_distance(s2, s1) == expected
+
+    def test_phonetic_score_range(self):
+        """Test that scores are 1.0 for identical, 0.0 for empty and in between otherwise."""
+        service = AudioService.__new__(AudioService)
+        assert service._calculate_phonetic_score("ɦɔnt", "ɦɔnt") == 1.0
+        assert service._calculate_phonetic_score("", "ɦɔnt") == 0.0
+        assert service._calculate_phonetic_score("kitten", "sitting") == pytest.approx(1 - 3 / 7)
+
+    def test_delete_expired_files(self, tmp_path):
+        """Test that only mp3 files past the expiry window are removed."""
+        service = AudioService.__new__(AudioService)
+        service.audio_dir = tmp_path
+        for name in ("old.mp3", "new.mp3", "old.txt"):
+            (tmp_path / name).write_bytes(b"audio")
+        expired = time.time() - (AudioService.AUDIO_EXPIRY_DAYS + 1) * 86400
+        os.utime(tmp_path / "old.mp3", (expired, expired))
+        os.utime(tmp_path / "old.txt", (expired, expired))
+
+        assert service._delete_expired_files() == 1
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["new.mp3", "old.txt"]
+
+    def test_stored_reference_ipa(self):
+        """Test that stored IPA is only reused for the text it was generated from."""
+        filename = AudioService._audio_filename("anki_card:1", "hond")
+        card = AnkiCard(
+            id="anki_card:1",
+            front="hond",
+            back="dog",
+            audio_metadata=AudioMetadata(
+                reference_mp3=f"/data/audio/{filename}",
+                ipa_transcriptions=["ɦɔnt"],
+            ),
+        )
+        assert AudioService.stored_reference_ipa(card, "hond") == "ɦɔnt"
+        assert AudioService.stored_reference_ipa(card, "kat") is None
+        card.audio_metadata = None
+        assert AudioService.stored_reference_ipa(card, "hond") is None
+
+    def test_stand_in_phonemizer_output_is_not_cached(self):
+        """Raw text from the phonemizer stand-in never reaches either IPA cache."""
+        with patch.object(audio_service, "_IPA_BACKEND", "none"), \
+                patch.object(audio_service, "_store_ipa") as store:
+            assert audio_service._texts_to_ipa(["hond", "kat"], "nl-test") == ["hond", "kat"]
+        store.assert_not_called()
+        assert ("hond", "nl-test") not in audio_service._ipa_cache
+
+    def test_ipa_batch_larger_than_memo(self):
+        """Memo hits evicted while a large batch is remembered are still returned."""
+        language = "nl-batch-test"
+        texts = [f"woord{i}" for i in range(audio_service._IPA_CACHE_SIZE + 10)]
+        with patch.object(audio_service, "_IPA_BACKEND", "phonemizer"), \
+                patch.object(audio_service, "_ipa_cache", audio_service.OrderedDict()), \
+                patch.object(audio_service, "_load_ipa", return_value={}), \
+                patch.object(audio_service, "_store_ipa"), \
+                patch.object(audio_service, "_get_phonemizer_backend") as backend:
+            backend.return_value.phonemize.side_effect = lambda batch, **kw: [f"/{t}/" for t in batch]
+            audio_service._remember_ipa(texts[0], language, "/cached/")
+            result = audio_service._texts_to_ipa(texts, language)
+        assert result[0] == "/cached/"
+        assert result[1:] == [f"/{t}/" for t in texts[1:]]
+
+    @pytest.mark.asyncio
+    async def test_warmup_skips_wyoming_port_and_keeps_piper_enabled(self):
+        """Warmup never probes the Wyoming port or opens the Piper cooldown."""
+        client = AsyncMock()
+        client.get.side_effect = httpx.ConnectError("unreachable")
+        with patch.object(AudioService, "_get_http_client", return_value=client), \
+                patch.object(AudioService, "PIPER_URL", "http://piper:10200"), \
+                patch.object(AudioService, "_piper_unavailable_until", 0.0):
+            await AudioService.warmup()
+            assert AudioService._piper_unavailable_until == 0.0
+        requested = [call.args[0] for call in client.get.call_args_list]
+        assert requested == [AudioService.WHISPER_URL]
@@ -11,6 +11,7 @@ from open_notebook.utils import (
     clean_thinking_content,
     compare_versions,
     get_installed_version,
+    json_loads,
     parse_thinking_content,
     remove_non_ascii,
     remove_non_printable,
@@ -254,5 +255,26 @@ class TestContextBuilder:
         assert builder.include_insights is False
 
 
+# ============================================================================
+# TEST SUITE 5: JSON Utilities
+# ============================================================================
+
+
+class TestJsonUtilities:
+    """Test suite for JSON utility functions."""
+
+    def test_json_loads_str_and_bytes(self):
+        """Test parsing from both str and bytes input."""
+        assert json_loads('[{"front": "a"}]') == [{"front": "a"}]
+        assert json_loads(b'{"back": "b"}') == {"back": "b"}
+
+    def test_json_loads_invalid_raises_stdlib_error(self):
+        """Test that invalid input raises json.JSONDecodeError for either backend."""
+        import json
+
+        with pytest.raises(json.JSONDecodeError):
+            json_loads("not json")
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])